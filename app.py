@@ -1,24 +1,66 @@
-from flask import Flask, render_template, request, redirect, url_for, flash, jsonify, session
+from flask import Flask, Request, render_template, request, redirect, url_for, flash, jsonify, session, Response, g, has_request_context, current_app, stream_with_context
+from flask.json.provider import DefaultJSONProvider
 from flask_sqlalchemy import SQLAlchemy
 from flask_login import LoginManager, login_user, logout_user, login_required, current_user
+from sqlalchemy import event, func, insert, lambda_stmt, literal, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session, joinedload, load_only, raiseload, selectinload
 import os
+import csv
 import json
-from datetime import datetime
+import shutil
+import time
+import hashlib
+import queue
+import atexit
+import bisect
+import random
+import secrets
+import threading
+import traceback
+import orjson
+import requests
+from datetime import datetime, timedelta
+from io import StringIO
+from werkzeug.middleware.proxy_fix import ProxyFix
 from werkzeug.utils import secure_filename
 from dotenv import load_dotenv
 from functools import wraps
+from jinja2 import FileSystemBytecodeCache
+from concurrent.futures import ThreadPoolExecutor
 
 # Load environment variables
 load_dotenv()
 
+class UploadRequest(Request):
+    """Request with tighter multipart limits so malformed forms fail fast"""
+    max_form_memory_size = 512 * 1024  # non-file form fields
+    max_form_parts = 100
+
 app = Flask(__name__)
+app.request_class = UploadRequest
+
+# Behind a reverse proxy every request comes from the proxy's address.
+# Trust X-Forwarded-For/-Proto from that many proxy hops so remote_addr
+# (the login rate limit key) and url_for see the real client.
+TRUSTED_PROXY_COUNT = int(os.environ.get('TRUSTED_PROXY_COUNT', 0))
+if TRUSTED_PROXY_COUNT:
+    app.wsgi_app = ProxyFix(app.wsgi_app, x_for=TRUSTED_PROXY_COUNT, x_proto=TRUSTED_PROXY_COUNT)
 
 # Configuration
 app.config['SECRET_KEY'] = os.environ.get('SECRET_KEY', 'dev-secret-key-change-in-production')
 app.config['UPLOAD_FOLDER'] = os.path.join('static', 'img', 'rivers')
 app.config['PROFILE_UPLOAD_FOLDER'] = os.path.join('static', 'img', 'profiles')
+app.config['REPORT_UPLOAD_FOLDER'] = os.path.join('static', 'img', 'reports')
 app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB max file size
 ALLOWED_EXTENSIONS = {'png', 'jpg', 'jpeg', 'gif', 'webp'}
+UPLOAD_CHUNK_SIZE = 1 << 20  # 1MB copy buffer for uploads
+
+# Create upload folders once at startup instead of on every upload
+for folder in ('UPLOAD_FOLDER', 'PROFILE_UPLOAD_FOLDER', 'REPORT_UPLOAD_FOLDER'):
+    os.makedirs(app.config[folder], exist_ok=True)
 
 # Database Configuration (Supabase PostgreSQL)
 DATABASE_URL = os.environ.get('DATABASE_URL')
@@ -26,6 +68,25 @@ if DATABASE_URL:
     if DATABASE_URL.startswith('postgres://'):
         DATABASE_URL = DATABASE_URL.replace('postgres://', 'postgresql://', 1)
     app.config['SQLALCHEMY_DATABASE_URI'] = DATABASE_URL
+    # Ping pooled connections on checkout so sockets dropped by the
+    # Supabase pooler are replaced instead of failing the request. LIFO
+    # checkout reuses warm connections and lets surplus ones idle out.
+    # Pool sizes are per worker process; keep workers * (size + overflow)
+    # under the database's connection limit.
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {
+        'pool_pre_ping': True,
+        'pool_size': int(os.environ.get('DB_POOL_SIZE', 10)),
+        'max_overflow': int(os.environ.get('DB_MAX_OVERFLOW', 20)),
+        'pool_recycle': 1800,
+        'pool_use_lifo': True,
+        'query_cache_size': 1200  # compiled SQL cache entries per engine
+    }
+    if 'supabase' in DATABASE_URL:
+        # Transaction pooler (port 6543) closes idle connections sooner
+        if ':6543/' in DATABASE_URL:
+            app.config['SQLALCHEMY_ENGINE_OPTIONS']['pool_recycle'] = 600
+        if 'sslmode=' not in DATABASE_URL:
+            app.config['SQLALCHEMY_ENGINE_OPTIONS']['connect_args'] = {'sslmode': 'require'}
 else:
     app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///debrisense.db'
     
@@ -34,9 +95,19 @@ app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
 # WeatherAPI Configuration
 WEATHER_API_KEY = os.environ.get('WEATHER_API_KEY', '84b6782ee30a4551acc83954252608')
 WEATHER_API_URL = 'http://api.weatherapi.com/v1/current.json'
+WEATHER_API_TIMEOUT = (2, 3)  # (connect, read) seconds
+WEATHER_CACHE_TTL = 300
+WEATHER_CACHE_MAX_ENTRIES = 512
+
+# Shared HTTP session (connection pooling) and responses cached per
+# location rounded to 2 decimal places (~1 km). Writes and pruning hold
+# _weather_cache_lock so request threads never iterate a resizing dict.
+_weather_session = requests.Session()
+_weather_cache = {}
+_weather_cache_lock = threading.Lock()
 
 # Initialize extensions
-from models import db, User, Admin, River, DRIReading, HotspotReport, Watchlist, LocationRequest, Alert
+from models import db, User, Admin, River, DRIReading, HotspotReport, Watchlist, LocationRequest, Alert, ALERT_COUNTER_SQL, DEBRIS_AMOUNTS, DEBRIS_TYPES, LAND_USES, REPORT_STATUSES, REQUEST_STATUSES, PasswordCheckBusy, debris_profile_for, format_date, format_datetime, utcnow
 db.init_app(app)
 
 # Initialize Flask-Login
@@ -46,94 +117,372 @@ login_manager.login_view = 'login'
 login_manager.login_message = 'Please log in to access this page.'
 login_manager.login_message_category = 'info'
 
+# Session ids are '<role char><id>' (see Admin.get_id / User.get_id)
+USER_LOADERS = {'a': Admin, 'u': User}
+
 @login_manager.user_loader
 def load_user(user_id):
     """Load user by ID - handles Admin, NGO, and Regular users"""
-    if user_id.startswith('admin_'):
-        admin_id = int(user_id.replace('admin_', ''))
-        return Admin.query.get(admin_id)
-    elif user_id.startswith('user_'):
-        ngo_id = int(user_id.replace('user_', ''))
-        return User.query.get(ngo_id)
-    return None
+    model = USER_LOADERS.get(user_id[:1])
+    if model is None:
+        return None
+    pk = user_id[1:]
+    if not pk.isdigit():
+        # Legacy 'admin_<id>' / 'user_<id>' ids from older sessions
+        pk = user_id.rpartition('_')[2]
+        if not pk.isdigit():
+            return None
+    user = db.session.get(model, int(pk))
+    g._role_code = user_id[:1]
+    return user
+
+def current_user_role():
+    """Role code of the logged-in user ('a' admin, 'u' NGO), memoized on g"""
+    role_code = g.get('_role_code')
+    if role_code is None:
+        user_id = current_user.get_id()
+        role_code = g._role_code = user_id[:1] if user_id else ''
+    return role_code
+
+def current_user_is_admin():
+    """True if the logged-in user is an Admin"""
+    return current_user_role() == 'a'
+
+# Development diagnostics: count SQL statements per request and warn when
+# a request runs more than QUERY_WARN_THRESHOLD of them. Setting
+# SQLALCHEMY_RAISELOAD=1 additionally turns lazy relationship loads into
+# errors so N+1 patterns surface before they reach production.
+DEV_MODE = os.environ.get('FLASK_ENV') == 'development' or os.environ.get('FLASK_DEBUG') == '1'
+QUERY_WARN_THRESHOLD = 5
+
+# Templates are only re-checked for changes in development; compiled
+# template bytecode is cached on disk so fresh workers skip the parse
+app.config['TEMPLATES_AUTO_RELOAD'] = DEV_MODE
+app.jinja_env.auto_reload = DEV_MODE
+app.jinja_env.bytecode_cache = FileSystemBytecodeCache()
+
+if DEV_MODE:
+    @event.listens_for(Engine, 'before_cursor_execute')
+    def count_request_queries(conn, cursor, statement, parameters, context, executemany):
+        if has_request_context():
+            g._query_count = g.get('_query_count', 0) + 1
+
+    @app.after_request
+    def warn_on_query_count(response):
+        query_count = g.get('_query_count', 0)
+        if query_count > QUERY_WARN_THRESHOLD:
+            print(f"[WARN] {request.method} {request.path} ran {query_count} queries")
+        return response
+
+    if os.environ.get('SQLALCHEMY_RAISELOAD') == '1':
+        @event.listens_for(Session, 'do_orm_execute')
+        def raise_on_lazy_load(orm_execute_state):
+            if orm_execute_state.is_select and not orm_execute_state.is_relationship_load:
+                orm_execute_state.statement = orm_execute_state.statement.options(
+                    raiseload('*', sql_only=True)
+                )
+
+# Login attempts per client address and form within a fixed window, checked
+# before the (deliberately slow) password hash so bursts cannot tie up
+# workers. Counts are per worker process, so with N workers a client gets
+# up to N * LOGIN_RATE_LIMIT attempts per window.
+LOGIN_RATE_LIMIT = 5
+LOGIN_RATE_WINDOW = 60  # seconds
+_login_attempts = {}
+_login_attempts_lock = threading.Lock()
+
+def login_rate_limited():
+    """Record a login attempt and return True if the client is over the limit"""
+    key = (request.endpoint, request.remote_addr)
+    now = time.monotonic()
+    with _login_attempts_lock:
+        window_start, attempts = _login_attempts.get(key, (now, 0))
+        if now - window_start >= LOGIN_RATE_WINDOW:
+            window_start, attempts = now, 0
+        _login_attempts[key] = (window_start, attempts + 1)
+        if len(_login_attempts) > 10000:
+            for stale_key in [k for k, v in _login_attempts.items() if now - v[0] >= LOGIN_RATE_WINDOW]:
+                del _login_attempts[stale_key]
+    return attempts + 1 > LOGIN_RATE_LIMIT
 
 def allowed_file(filename):
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
-# Custom decorators for role-based access
-def admin_required(f):
-    """Decorator to require admin login"""
-    @wraps(f)
-    def decorated_function(*args, **kwargs):
-        if not current_user.is_authenticated:
-            if request.path.startswith('/api/'):
-                return jsonify({'success': False, 'error': 'Authentication required'}), 401
-            flash('Please log in as admin to access this page.', 'warning')
-            return redirect(url_for('admin_login'))
-        if not isinstance(current_user, Admin):
-            if request.path.startswith('/api/'):
-                return jsonify({'success': False, 'error': 'Access denied. Admin privileges required.'}), 403
-            flash('Access denied. Admin privileges required.', 'error')
-            return redirect(url_for('index'))
-        return f(*args, **kwargs)
-    return decorated_function
-
-def ngo_required(f):
-    """Decorator to require NGO user login"""
-    @wraps(f)
-    def decorated_function(*args, **kwargs):
-        if not current_user.is_authenticated:
-            if request.path.startswith('/api/'):
-                return jsonify({'success': False, 'error': 'Authentication required'}), 401
-            flash('Please log in to access this page.', 'warning')
-            return redirect(url_for('login'))
-        if not isinstance(current_user, User):
-            if request.path.startswith('/api/'):
-                return jsonify({'success': False, 'error': 'Access denied. NGO account required.'}), 403
-            flash('Access denied. NGO account required.', 'error')
-            return redirect(url_for('index'))
-        return f(*args, **kwargs)
-    return decorated_function
+class OrjsonProvider(DefaultJSONProvider):
+    """jsonify()/request.get_json() backed by orjson; pretty/custom dumps use the stdlib"""
+    option = orjson.OPT_NON_STR_KEYS
+
+    def dumps(self, obj, **kwargs):
+        if kwargs:
+            return super().dumps(obj, **kwargs)
+        return orjson.dumps(obj, default=self.default, option=self.option).decode()
+
+    def loads(self, s, **kwargs):
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        if self._app.debug:
+            return super().response(*args, **kwargs)
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(
+            orjson.dumps(obj, default=self.default, option=self.option), mimetype=self.mimetype
+        )
+
+app.json = OrjsonProvider(app)
 
+def conditional_json(fingerprint, build):
+    """jsonify(build()) tagged with an ETag derived from fingerprint; 304 if the client has it"""
+    etag = hashlib.blake2b(repr(fingerprint).encode(), digest_size=16).hexdigest()
+    if request.if_none_match.contains(etag):
+        response = Response(status=304)
+    else:
+        response = jsonify(build())
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response
 
+# Upload writes run here so the request thread can keep building the ORM
+# changes; handlers wait on the future before committing
+upload_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix='upload')
+UPLOAD_WRITE_TIMEOUT = 30  # seconds
 
-# Create database tables and default admin
-with app.app_context():
-    # Create tables if they don't exist
-    try:
-        db.create_all()
-    except Exception as e:
-        print(f"Database connection/creation error: {e}")
+def save_upload(file, file_path):
+    """Stream an uploaded file to disk in UPLOAD_CHUNK_SIZE chunks"""
+    with open(file_path, 'wb') as dst:
+        shutil.copyfileobj(file.stream, dst, UPLOAD_CHUNK_SIZE)
+
+# Custom decorators for role-based access
+def role_required(role_code, login_endpoint, login_message, denied_message):
+    """Build a decorator requiring a logged-in user with the given role code"""
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            if not current_user.is_authenticated:
+                if request.path.startswith('/api/'):
+                    return jsonify({'success': False, 'error': 'Authentication required'}), 401
+                flash(login_message, 'warning')
+                return redirect(url_for(login_endpoint))
+            if current_user_role() != role_code:
+                if request.path.startswith('/api/'):
+                    return jsonify({'success': False, 'error': denied_message}), 403
+                flash(denied_message, 'error')
+                return redirect(url_for('index'))
+            return f(*args, **kwargs)
+        return decorated_function
+    return decorator
+
+# Decorator to require admin login
+admin_required = role_required('a', 'admin_login', 'Please log in as admin to access this page.',
+                               'Access denied. Admin privileges required.')
+
+# Decorator to require NGO user login
+ngo_required = role_required('u', 'login', 'Please log in to access this page.',
+                             'Access denied. NGO account required.')
+
+
+
+# Create database tables and default admin. Runs from `python app.py` or
+# `flask --app app init-db`, not on import, so workers and scripts that
+# import the app skip the schema check and admin lookup.
+def init_db():
+    """Create tables if they don't exist and the default admin account"""
+    with app.app_context():
+        # Create tables if they don't exist
+        try:
+            db.create_all()
+        except Exception as e:
+            print(f"Database connection/creation error: {e}")
+        
+        # Bring databases created before the unread alert counter up to date
+        try:
+            install_alert_counter()
+        except Exception as e:
+            print(f"Alert counter migration error: {e}")
     
-    # Create default admin if not exists
-    try:
-        default_admin = Admin.query.filter_by(email='admin@debrisense.my').first()
-        if not default_admin:
-            admin = Admin(
-                email='admin@debrisense.my',
-                name='DebriSense Admin'
-            )
-            admin.set_password('123456')
-            db.session.add(admin)
-            db.session.commit()
-            print("[OK] Default admin created: admin@debrisense.my / 123456")
-        else:
-            print("[OK] Admin account exists")
-    except Exception as e: 
-        print(f"Admin creation error: {e}")
-        db.session.rollback()
+        # Create default admin if not exists
+        try:
+            default_admin = Admin.query.filter_by(email='admin@debrisense.my').first()
+            if not default_admin:
+                admin = Admin(
+                    email='admin@debrisense.my',
+                    name='DebriSense Admin'
+                )
+                admin.set_password('123456')
+                db.session.add(admin)
+                db.session.commit()
+                print("[OK] Default admin created: admin@debrisense.my / 123456")
+            else:
+                print("[OK] Admin account exists")
+        except Exception as e: 
+            print(f"Admin creation error: {e}")
+            db.session.rollback()
     
-    print("[OK] Database ready!")
+        print("[OK] Database ready!")
+
+@app.cli.command('init-db')
+def init_db_command():
+    """Create database tables and the default admin"""
+    init_db()
+
+# dri_readings is append-only time-series data queried by time range. On
+# PostgreSQL with TimescaleDB it becomes a hypertable with 30-day chunks, so
+# range queries skip chunks outside the window, and chunks older than 7 days
+# are compressed per river. Hypertable unique keys must include the time
+# column, hence the (id, recorded_at) primary key.
+TIMESCALE_SETUP_SQL = (
+    "CREATE EXTENSION IF NOT EXISTS timescaledb",
+    "ALTER TABLE dri_readings ALTER COLUMN recorded_at SET NOT NULL",
+    "ALTER TABLE dri_readings DROP CONSTRAINT IF EXISTS dri_readings_pkey",
+    "ALTER TABLE dri_readings ADD PRIMARY KEY (id, recorded_at)",
+    "SELECT create_hypertable('dri_readings', by_range('recorded_at', INTERVAL '30 days'), migrate_data => TRUE)",
+    "ALTER TABLE dri_readings SET (timescaledb.compress, timescaledb.compress_segmentby = 'river_id', "
+    "timescaledb.compress_orderby = 'recorded_at DESC')",
+    "SELECT add_compression_policy('dri_readings', INTERVAL '7 days', if_not_exists => TRUE)",
+)
+
+@app.cli.command('init-timescale')
+def init_timescale_command():
+    """Convert dri_readings into a compressed TimescaleDB hypertable"""
+    if db.engine.dialect.name != 'postgresql':
+        print("[SKIP] TimescaleDB needs PostgreSQL")
+        return
+    with db.engine.begin() as conn:
+        installed = conn.execute(db.text(
+            "SELECT 1 FROM pg_extension WHERE extname = 'timescaledb'"
+        )).scalar()
+        if installed and conn.execute(db.text(
+            "SELECT 1 FROM timescaledb_information.hypertables WHERE hypertable_name = 'dri_readings'"
+        )).scalar():
+            print("[OK] dri_readings is already a hypertable")
+            return
+        for statement in TIMESCALE_SETUP_SQL:
+            conn.execute(db.text(statement))
+    print("[OK] dri_readings converted to a TimescaleDB hypertable")
+
+def install_alert_counter():
+    """Add users.unread_alert_count if missing, (re)install its triggers and backfill it"""
+    with db.engine.begin() as conn:
+        columns = {c['name'] for c in db.inspect(conn).get_columns('users')}
+        if 'unread_alert_count' not in columns:
+            conn.execute(db.text("ALTER TABLE users ADD COLUMN unread_alert_count INTEGER NOT NULL DEFAULT 0"))
+        for statement in ALERT_COUNTER_SQL.get(conn.dialect.name, ()):
+            conn.exec_driver_sql(statement)
+        # Backfill in the same transaction as the triggers so no alert is missed
+        conn.execute(db.text(
+            "UPDATE users SET unread_alert_count = "
+            "(SELECT COUNT(*) FROM alerts WHERE alerts.user_id = users.id AND alerts.is_read = false)"
+        ))
+    print("[OK] Unread alert counter installed")
+
+@app.cli.command('init-alert-counter')
+def init_alert_counter_command():
+    """Add users.unread_alert_count to an existing database and install its triggers"""
+    install_alert_counter()
 
 # ============================================
 # Helper Functions
 # ============================================
 
+# Hot lookups built with lambda_stmt: the statement's cache key comes from
+# the lambda's code location, so repeat calls skip building and compiling
+# the SQL and only bind new parameter values.
+def find_user_by_email(email):
+    """NGO user with this (lower-cased) email, or None"""
+    stmt = lambda_stmt(lambda: select(User).where(func.lower(User.email) == email).limit(1))
+    return db.session.execute(stmt).scalar_one_or_none()
+
+def find_admin_by_email(email):
+    """Admin with this (lower-cased) email, or None"""
+    stmt = lambda_stmt(lambda: select(Admin).where(func.lower(Admin.email) == email).limit(1))
+    return db.session.execute(stmt).scalar_one_or_none()
+
+def insert_ignoring_duplicates(model):
+    """INSERT for the bound database that supports on_conflict_do_nothing()"""
+    if db.engine.dialect.name == 'postgresql':
+        return pg_insert(model)
+    return sqlite_insert(model)
+
+# Process-wide cache of the active river catalog. Entries are keyed by
+# _rivers_version, which every river write bumps, and expire after
+# RIVERS_CACHE_TTL seconds so other workers pick up changes as well.
+RIVERS_CACHE_TTL = 60
+_rivers_cache = {}
+_rivers_version = 0
+
+# Keys of a catalog entry. /api/rivers?fields=id,name returns only the
+# listed keys (dropdowns don't need info text or debris profiles); the
+# JSON of up to RIVERS_SPARSE_CACHE_LIMIT field sets is cached per entry.
+RIVER_FIELDS = ('id', 'name', 'latitude', 'longitude', 'info', 'image', 'admin_id', 'added_by',
+                'date_added', 'state', 'district', 'land_use', 'debris_profile')
+RIVERS_SPARSE_CACHE_LIMIT = 8
+
+def invalidate_rivers_cache():
+    """Drop cached rivers after a river is added, edited or deleted"""
+    global _rivers_version
+    _rivers_version += 1
+    _rivers_cache.clear()
+
+def query_river_rows():
+    """Load active rivers in River.to_dict() shape from a column projection"""
+    stmt = (
+        select(River.id, River.name, River.latitude, River.longitude, River.info,
+               River.image, River.admin_id, Admin.name.label('added_by'),
+               River.date_added, River.state, River.district, River.land_use)
+        .outerjoin(Admin, River.admin_id == Admin.id)
+        .where(River.is_active.is_(True))
+    )
+    rivers = []
+    for row in db.session.execute(stmt):
+        land_use = row.land_use or 'urban'
+        rivers.append({
+            'id': row.id,
+            'name': row.name,
+            'latitude': row.latitude,
+            'longitude': row.longitude,
+            'info': row.info or '',
+            'image': row.image,
+            'admin_id': row.admin_id,
+            'added_by': row.added_by or 'System',
+            'date_added': format_date(row.date_added),
+            'state': row.state,
+            'district': row.district,
+            'land_use': land_use,
+            'debris_profile': debris_profile_for(land_use)
+        })
+    return rivers
+
+def _cached_rivers():
+    """Return the cache entry for the active rivers, reloading it if stale"""
+    version = _rivers_version
+    entry = _rivers_cache.get(version)
+    if entry and entry['expires_at'] > time.monotonic():
+        return entry
+
+    rivers = query_river_rows()
+    entry = {
+        'rivers': rivers,
+        'json': orjson.dumps(rivers),
+        'sparse': {},
+        'expires_at': time.monotonic() + RIVERS_CACHE_TTL
+    }
+    _rivers_cache[version] = entry
+    return entry
+
+def sparse_rivers_json(entry, fields):
+    """JSON of a catalog entry's rivers restricted to the given keys"""
+    rivers_json = entry['sparse'].get(fields)
+    if rivers_json is None:
+        rivers_json = orjson.dumps([{field: river[field] for field in fields} for river in entry['rivers']])
+        if len(entry['sparse']) < RIVERS_SPARSE_CACHE_LIMIT:
+            entry['sparse'][fields] = rivers_json
+    return rivers_json
+
 def load_rivers_from_db():
     """Load rivers from PostgreSQL database"""
     try:
-        rivers = River.query.filter_by(is_active=True).all()
-        return [r.to_dict() for r in rivers]
+        return _cached_rivers()['rivers']
     except Exception as e:
         print(f"Error loading rivers from DB: {e}")
         return []  # Return empty list instead of falling back to JSON
@@ -163,11 +512,85 @@ def migrate_json_to_db():
                 )
                 db.session.add(river)
         db.session.commit()
+        invalidate_rivers_cache()
         print("Migration complete!")
     except Exception as e:
         print(f"Migration error: {e}")
         db.session.rollback()
 
+# DRI readings are written behind the request: get_river_dri queues the
+# row and a background thread inserts queued rows in batches of up to
+# DRI_FLUSH_BATCH_SIZE, or whatever arrived within DRI_FLUSH_INTERVAL seconds.
+# At exit a None on the queue makes the thread save its current batch and
+# stop; the exit handler waits up to DRI_DRAIN_TIMEOUT seconds for it.
+DRI_FLUSH_BATCH_SIZE = 100
+DRI_FLUSH_INTERVAL = 2
+DRI_DRAIN_TIMEOUT = 10
+_reading_queue = queue.Queue()
+_reading_writer = None
+_reading_writer_lock = threading.Lock()
+
+def save_dri_readings(batch):
+    """Insert a batch of DRI reading rows in a single transaction"""
+    with app.app_context():
+        try:
+            db.session.bulk_insert_mappings(DRIReading, batch)
+            db.session.commit()
+        except Exception as e:
+            print(f"Error saving DRI readings: {e}")
+            db.session.rollback()
+
+def _flush_readings():
+    """Background loop draining the DRI reading queue until it receives None"""
+    while True:
+        reading = _reading_queue.get()
+        batch = []
+        deadline = time.monotonic() + DRI_FLUSH_INTERVAL
+        while reading is not None:
+            batch.append(reading)
+            remaining = deadline - time.monotonic()
+            if len(batch) >= DRI_FLUSH_BATCH_SIZE or remaining <= 0:
+                break
+            try:
+                reading = _reading_queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+        if batch:
+            save_dri_readings(batch)
+        for _ in batch:
+            _reading_queue.task_done()
+        if reading is None:
+            _reading_queue.task_done()
+            return
+
+def queue_dri_reading(reading):
+    """Queue a DRI reading row, starting the writer thread on first use"""
+    global _reading_writer
+    if _reading_writer is None or not _reading_writer.is_alive():
+        with _reading_writer_lock:
+            if _reading_writer is None or not _reading_writer.is_alive():
+                _reading_writer = threading.Thread(target=_flush_readings, name='dri-writer', daemon=True)
+                _reading_writer.start()
+    _reading_queue.put(reading)
+
+@atexit.register
+def _drain_readings():
+    """Persist readings still queued or being written when the process exits"""
+    writer = _reading_writer
+    if writer is not None and writer.is_alive():
+        _reading_queue.put(None)
+        writer.join(DRI_DRAIN_TIMEOUT)
+    batch = []
+    while True:
+        try:
+            reading = _reading_queue.get_nowait()
+        except queue.Empty:
+            break
+        if reading is not None:
+            batch.append(reading)
+    if batch:
+        save_dri_readings(batch)
+
 # ============================================
 # Public Routes
 # ============================================
@@ -191,23 +614,37 @@ def be_part_of_us():
 def login():
     """NGO Login page"""
     if current_user.is_authenticated:
-        if isinstance(current_user, Admin):
+        if current_user_is_admin():
             return redirect(url_for('admin_dashboard'))
         return redirect(url_for('ngo_dashboard'))
     
     if request.method == 'POST':
-        email = request.form.get('email')
+        if login_rate_limited():
+            flash('Too many login attempts. Please wait a minute and try again.', 'error')
+            return render_template('login.html'), 429
+        
+        email = (request.form.get('email') or '').strip().lower()
         password = request.form.get('password')
         remember = request.form.get('remember', False)
         
-        user = User.query.filter_by(email=email).first()
+        user = find_user_by_email(email)
         
-        if user and user.check_password(password):
+        try:
+            valid = user is not None and user.check_password(password)
+        except PasswordCheckBusy:
+            flash('The server is busy. Please try again in a moment.', 'error')
+            return render_template('login.html'), 429
+        except TimeoutError:
+            flash('Login is temporarily unavailable. Please try again.', 'error')
+            return render_template('login.html'), 503
+        
+        if valid:
             if not user.is_active:
                 flash('Your account has been deactivated. Please contact support.', 'error')
                 return redirect(url_for('login'))
             
             login_user(user, remember=bool(remember))
+            db.session.commit()  # persist a password hash upgraded by check_password
             flash(f'Welcome back, {user.ngo_name}!', 'success')
             
             next_page = request.args.get('next')
@@ -221,13 +658,13 @@ def login():
 def register():
     """NGO Registration page"""
     if current_user.is_authenticated:
-        if isinstance(current_user, Admin):
+        if current_user_is_admin():
             return redirect(url_for('admin_dashboard'))
         return redirect(url_for('ngo_dashboard'))
     
     if request.method == 'POST':
         ngo_name = request.form.get('ngo_name')
-        email = request.form.get('email')
+        email = (request.form.get('email') or '').strip().lower()
         password = request.form.get('password')
         confirm_password = request.form.get('confirm_password')
         phone = request.form.get('phone')
@@ -241,7 +678,7 @@ def register():
             flash('Password must be at least 8 characters long!', 'error')
             return redirect(url_for('register'))
         
-        existing_user = User.query.filter_by(email=email).first()
+        existing_user = find_user_by_email(email)
         if existing_user:
             flash('An account with this email already exists.', 'error')
             return redirect(url_for('register'))
@@ -301,6 +738,7 @@ def ngo_profile():
 def update_ngo_profile():
     """Update NGO profile"""
     try:
+        upload = None
         current_user.ngo_name = request.form.get('ngo_name', current_user.ngo_name)
         current_user.phone = request.form.get('phone', current_user.phone)
         current_user.address = request.form.get('address', current_user.address)
@@ -311,12 +749,13 @@ def update_ngo_profile():
                 ext = file.filename.rsplit('.', 1)[1].lower()
                 filename = f"ngo_{current_user.id}.{ext}"
                 
-                os.makedirs(app.config['PROFILE_UPLOAD_FOLDER'], exist_ok=True)
                 file_path = os.path.join(app.config['PROFILE_UPLOAD_FOLDER'], filename)
-                file.save(file_path)
+                upload = upload_executor.submit(save_upload, file, file_path)
                 
                 current_user.profile_image = filename
         
+        if upload:
+            upload.result(timeout=UPLOAD_WRITE_TIMEOUT)
         db.session.commit()
         flash('Profile updated successfully!', 'success')
     except Exception as e:
@@ -333,18 +772,31 @@ def update_ngo_profile():
 def admin_login():
     """Admin Login page"""
     if current_user.is_authenticated:
-        if isinstance(current_user, Admin):
+        if current_user_is_admin():
             return redirect(url_for('admin_dashboard'))
         # If NGO user is logged in, log them out first
         logout_user()
     
     if request.method == 'POST':
-        email = request.form.get('email')
+        if login_rate_limited():
+            flash('Too many login attempts. Please wait a minute and try again.', 'error')
+            return render_template('admin_login.html'), 429
+        
+        email = (request.form.get('email') or '').strip().lower()
         password = request.form.get('password')
         
-        admin = Admin.query.filter_by(email=email).first()
+        admin = find_admin_by_email(email)
         
-        if admin and admin.check_password(password):
+        try:
+            valid = admin is not None and admin.check_password(password)
+        except PasswordCheckBusy:
+            flash('The server is busy. Please try again in a moment.', 'error')
+            return render_template('admin_login.html'), 429
+        except TimeoutError:
+            flash('Login is temporarily unavailable. Please try again.', 'error')
+            return render_template('admin_login.html'), 503
+        
+        if valid:
             if not admin.is_active:
                 flash('This admin account has been deactivated.', 'error')
                 return redirect(url_for('admin_login'))
@@ -378,7 +830,8 @@ def admin_logout():
 def admin_dashboard():
     """Admin Dashboard - full control over rivers"""
     rivers = load_rivers_from_db()
-    admin_rivers = River.query.filter_by(admin_id=current_user.id).all()
+    # Derive from the cached catalog instead of issuing a second query
+    admin_rivers = [r for r in rivers if r['admin_id'] == current_user.id]
     return render_template('admin_dashboard.html', 
                          rivers=rivers, 
                          admin_rivers=admin_rivers,
@@ -397,7 +850,7 @@ def auth_session():
     if not current_user.is_authenticated:
         return jsonify({'authenticated': False, 'role': None})
 
-    if isinstance(current_user, Admin):
+    if current_user_is_admin():
         return jsonify({'authenticated': True, 'role': 'admin'})
 
     if isinstance(current_user, User):
@@ -411,10 +864,6 @@ def auth_session():
 
 def generate_mock_reports_for_river(river):
     """Generate deterministic mock debris reports for a river."""
-    import hashlib
-    import random
-    from datetime import timedelta
-
     seed_input = f"{river.id}-{river.name}"
     seed_hex = hashlib.md5(seed_input.encode("utf-8")).hexdigest()[:8]
     seed = int(seed_hex, 16)
@@ -466,11 +915,13 @@ def get_river_reports(river_id):
     if False: # Removed authentication requirement for public access
         return jsonify({'success': False, 'error': 'Unauthorized'}), 401
 
-    river = River.query.get(river_id)
+    river = db.session.get(River, river_id)
     if not river:
         return jsonify({'success': False, 'error': 'River not found'}), 404
 
-    reports = HotspotReport.query.filter_by(river_id=river_id).order_by(HotspotReport.reported_at.desc()).all()
+    reports = HotspotReport.query.options(
+        selectinload(HotspotReport.user)
+    ).filter_by(river_id=river_id).order_by(HotspotReport.reported_at.desc()).all()
     return jsonify({
         'success': True,
         'reports': [r.to_dict() for r in reports],
@@ -480,91 +931,133 @@ def get_river_reports(river_id):
 @app.route('/api/rivers')
 def get_rivers():
     """API endpoint to get all rivers"""
-    rivers = load_rivers_from_db()
-    return jsonify(rivers)
+    fields = request.args.get('fields')
+    if fields:
+        fields = tuple(dict.fromkeys(fields.split(',')))
+        if not set(fields) <= set(RIVER_FIELDS):
+            return jsonify({'success': False, 'error': 'Unknown field'}), 400
+    try:
+        entry = _cached_rivers()
+        rivers_json = sparse_rivers_json(entry, fields) if fields else entry['json']
+    except Exception as e:
+        print(f"Error loading rivers from DB: {e}")
+        rivers_json = b'[]'
+    return Response(rivers_json, mimetype='application/json')
 
 @app.route('/api/test')
 def test_api():
     """Test endpoint to verify API is working"""
     return jsonify({'status': 'ok', 'message': 'API is working!'})
 
+def fetch_weather(latitude, longitude):
+    """Fetch current weather for a location, cached for WEATHER_CACHE_TTL seconds"""
+    key = (round(float(latitude), 2), round(float(longitude), 2))
+    now = time.monotonic()
+    cached = _weather_cache.get(key)
+    if cached and cached[0] > now:
+        return cached[1]
+    
+    try:
+        weather_response = _weather_session.get(
+            WEATHER_API_URL,
+            params={
+                'key': WEATHER_API_KEY,
+                'q': f"{latitude},{longitude}",
+                'aqi': 'no'
+            },
+            timeout=WEATHER_API_TIMEOUT
+        )
+        if weather_response.status_code != 200:
+            return None
+        weather_data = weather_response.json()
+    except Exception as e:
+        print(f"Weather API exception: {str(e)}")
+        return None
+    
+    with _weather_cache_lock:
+        if len(_weather_cache) >= WEATHER_CACHE_MAX_ENTRIES:
+            for stale_key in [k for k, v in _weather_cache.items() if v[0] <= now]:
+                del _weather_cache[stale_key]
+            if len(_weather_cache) >= WEATHER_CACHE_MAX_ENTRIES:
+                _weather_cache.clear()
+        _weather_cache[key] = (now + WEATHER_CACHE_TTL, weather_data)
+    return weather_data
+
 @app.route('/api/river/<int:river_id>/dri')
 def get_river_dri(river_id):
     """Get DRI (Debris Risk Index) for a specific river"""
     try:
-        river = River.query.get(river_id)
-        
+        river = db.session.get(River, river_id)
         if not river:
-            rivers = load_rivers_from_json()
-            river_data = next((r for r in rivers if r['id'] == river_id), None)
-            if not river_data:
-                return jsonify({'error': 'River not found'}), 404
-        else:
-            river_data = river.to_dict()
-        
-        import requests
-        weather_data = None 
-        try: 
-            weather_response = requests.get(
-                WEATHER_API_URL,
-                params={
-                    'key': WEATHER_API_KEY,
-                    'q': f"{river_data['latitude']},{river_data['longitude']}",
-                    'aqi': 'no'
-                },
-                timeout=10
-            )
-            if weather_response.status_code == 200:
-                weather_data = weather_response.json()
-        except Exception as e:
-            print(f"Weather API exception: {str(e)}")
-            weather_data = None
+            return jsonify({'error': 'River not found'}), 404
+        river_data = river.to_dict()
+        
+        weather_data = fetch_weather(river_data['latitude'], river_data['longitude'])
         
         dri_data = calculate_dri(river_data, weather_data)
         
-        try:
-            reading = DRIReading(
-                river_id=river_id,
-                dri_score=dri_data['dri_score'],
-                risk_level=dri_data['risk_level'],
-                rainfall=dri_data['factors']['rainfall']['value'],
-                wind_speed=dri_data['factors']['wind_speed']['value'],
-                tide_level=dri_data['factors']['tide_level']['value'],
-                water_flow=dri_data['factors']['water_flow']['value'],
-                estimated_debris_kg=dri_data['debris_estimate_kg']
-            )
-            db.session.add(reading)
-            db.session.commit()
-        except Exception as e:
-            print(f"Error saving DRI reading: {e}")
-            db.session.rollback()
+        queue_dri_reading({
+            'river_id': river_id,
+            'dri_score': dri_data['dri_score'],
+            'risk_level': dri_data['risk_level'],
+            'rainfall': dri_data['factors']['rainfall']['value'],
+            'wind_speed': dri_data['factors']['wind_speed']['value'],
+            'tide_level': dri_data['factors']['tide_level']['value'],
+            'water_flow': dri_data['factors']['water_flow']['value'],
+            'estimated_debris_kg': dri_data['debris_estimate_kg'],
+            # Stamped when read, not when the writer thread inserts the batch
+            'recorded_at': datetime.utcnow()
+        })
         
         return jsonify(dri_data)
     
     except Exception as e:
         print(f"Error in get_river_dri: {str(e)}")
-        import traceback
         traceback.print_exc()
         return jsonify({'error': str(e)}), 500
 
+# DRI factor values that map to a normalized score of 100
+MAX_RAINFALL = 50
+MAX_WIND = 40
+MAX_TIDE = 3
+MAX_FLOW = 100
+
+# Risk bands: a score below RISK_THRESHOLDS[i] maps to RISK_LEVELS[i]
+RISK_THRESHOLDS = (30, 50, 70, 85)
+RISK_LEVELS = (
+    ("Very Low", "#28a745"),
+    ("Low", "#90EE90"),
+    ("Medium", "#ffc107"),
+    ("High", "#fd7e14"),
+    ("Critical", "#dc3545")
+)
+
+# Debris categories of a DRI debris profile, in the order of the report amount sums
+PROFILE_DEBRIS_TYPES = ('plastic', 'organic', 'household', 'industrial', 'others')
+
+# Each worker thread draws simulated factors from its own generator
+_rng_local = threading.local()
+
+def _thread_rng():
+    """Return this thread's random generator, creating it on first use"""
+    rng = getattr(_rng_local, 'rng', None)
+    if rng is None:
+        rng = _rng_local.rng = random.Random()
+    return rng
+
 def calculate_dri(river, weather_data):
     """Calculate Debris Risk Index using weighted index methodology"""
-    import random
+    rng = _thread_rng()
     
     if weather_data and 'current' in weather_data:
         rainfall = weather_data['current'].get('precip_mm', 0)
         wind_speed = weather_data['current'].get('wind_kph', 0)
     else:
-        rainfall = random.uniform(0, 50)
-        wind_speed = random.uniform(0, 40)
-    
-    tide_level = random.uniform(0, 3)
-    water_flow = random.uniform(0, 100)
+        rainfall = rng.uniform(0, 50)
+        wind_speed = rng.uniform(0, 40)
     
-    MAX_RAINFALL = 50
-    MAX_WIND = 40
-    MAX_TIDE = 3
-    MAX_FLOW = 100
+    tide_level = rng.uniform(0, 3)
+    water_flow = rng.uniform(0, 100)
     
     rainfall_score = min((rainfall / MAX_RAINFALL) * 100, 100)
     wind_score = min((wind_speed / MAX_WIND) * 100, 100)
@@ -578,28 +1071,11 @@ def calculate_dri(river, weather_data):
         (flow_score * 0.15)
     )
     
-    if dri_score < 30:
-        risk_level = "Very Low"
-        risk_color = "#28a745"
-    elif dri_score < 50:
-        risk_level = "Low"
-        risk_color = "#90EE90"
-    elif dri_score < 70:
-        risk_level = "Medium"
-        risk_color = "#ffc107"
-    elif dri_score < 85:
-        risk_level = "High"
-        risk_color = "#fd7e14"
-    else:
-        risk_level = "Critical"
-        risk_color = "#dc3545"
+    risk_level, risk_color = RISK_LEVELS[bisect.bisect_right(RISK_THRESHOLDS, dri_score)]
     
     theoretical_debris_amount = (dri_score / 70) * 11600
     
     # Knowledge Engineering: Fetch past reports for this river to calculate multipliers
-    from models import HotspotReport
-    from flask import current_app
-    
     river_id = river.get('id') if isinstance(river, dict) else river.id
     
     learning_multiplier = 1.0
@@ -607,25 +1083,32 @@ def calculate_dri(river, weather_data):
     
     try:
         if current_app:
-            reports = HotspotReport.query.filter_by(river_id=river_id, status='resolved').all()
-            if reports:
-                # 1. Calculate learning multiplier for total payload
-                total_predicted = sum(r.snapshot_estimated_payload for r in reports if r.snapshot_estimated_payload)
-                total_actual = sum((r.plastic_amount or 0) + (r.organic_amount or 0) + (r.household_amount or 0) + 
-                                   (r.industrial_amount or 0) + (r.others_amount or 0) for r in reports)
+            # One aggregate over the river's resolved reports instead of
+            # loading every row and summing each category in Python
+            totals = db.session.execute(
+                select(
+                    func.sum(HotspotReport.snapshot_estimated_payload),
+                    func.sum(HotspotReport.plastic_amount),
+                    func.sum(HotspotReport.organic_amount),
+                    func.sum(HotspotReport.household_amount),
+                    func.sum(HotspotReport.industrial_amount),
+                    func.sum(HotspotReport.others_amount)
+                ).where(HotspotReport.river_id == river_id, HotspotReport.status == 'resolved')
+            ).one()
+            total_predicted = totals[0] or 0
+            actual_by_type = dict(zip(PROFILE_DEBRIS_TYPES, (amount or 0 for amount in totals[1:])))
+            total_actual = sum(actual_by_type.values())
+            
+            # 1. Calculate learning multiplier for total payload
+            if total_predicted > 0:
+                learning_multiplier = total_actual / total_predicted
                 
-                if total_predicted > 0:
-                    learning_multiplier = total_actual / total_predicted
-                    
-                # 2. Calculate empirical debris profile
-                if total_actual > 0:
-                    empirical_profile = {
-                        'plastic': ((sum(r.plastic_amount or 0 for r in reports)) / total_actual) * 100,
-                        'organic': ((sum(r.organic_amount or 0 for r in reports)) / total_actual) * 100,
-                        'household': ((sum(r.household_amount or 0 for r in reports)) / total_actual) * 100,
-                        'industrial': ((sum(r.industrial_amount or 0 for r in reports)) / total_actual) * 100,
-                        'others': ((sum(r.others_amount or 0 for r in reports)) / total_actual) * 100
-                    }
+            # 2. Calculate empirical debris profile
+            if total_actual > 0:
+                empirical_profile = {
+                    debris_type: (amount / total_actual) * 100
+                    for debris_type, amount in actual_by_type.items()
+                }
     except Exception:
         pass
 
@@ -639,14 +1122,7 @@ def calculate_dri(river, weather_data):
     if empirical_profile:
         debris_profile = empirical_profile
     elif not debris_profile:
-        profiles = {
-            'urban': {'plastic': 55, 'organic': 20, 'household': 15, 'industrial': 5, 'others': 5},
-            'industrial': {'plastic': 35, 'organic': 10, 'household': 10, 'industrial': 35, 'others': 10},
-            'rural': {'plastic': 25, 'organic': 45, 'household': 15, 'industrial': 5, 'others': 10},
-            'coastal': {'plastic': 40, 'organic': 20, 'household': 10, 'industrial': 10, 'others': 20},
-            'mixed': {'plastic': 45, 'organic': 25, 'household': 15, 'industrial': 10, 'others': 5}
-        }
-        debris_profile = profiles.get(land_use, profiles['urban'])
+        debris_profile = debris_profile_for(land_use)
     
     # Adjust debris profile based on weather conditions
     adjusted_profile = adjust_debris_profile(debris_profile, rainfall, wind_speed)
@@ -715,32 +1191,33 @@ def adjust_debris_profile(base_profile, rainfall, wind_speed):
 def add_river():
     """API endpoint to add new river (admin only)"""
     try:
-        if request.content_type and 'multipart/form-data' in request.content_type:
-            river_name = request.form.get('river_name')
-            latitude = float(request.form.get('latitude'))
-            longitude = float(request.form.get('longitude'))
-            info = request.form.get('info', '')
-            land_use = request.form.get('land_use', 'urban')
-            
-            image_filename = None
-            if 'river_image' in request.files:
-                file = request.files['river_image']
-                if file and file.filename and allowed_file(file.filename):
-                    ext = file.filename.rsplit('.', 1)[1].lower()
-                    safe_name = secure_filename(river_name.replace(' ', ''))
-                    image_filename = f"{safe_name}.{ext}"
-                    
-                    os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
-                    file_path = os.path.join(app.config['UPLOAD_FOLDER'], image_filename)
-                    file.save(file_path)
-        else:
-            data = request.get_json()
-            river_name = data.get('river_name')
+        is_multipart = bool(request.content_type and 'multipart/form-data' in request.content_type)
+        data = request.form if is_multipart else (request.get_json(silent=True) or {})
+        river_name = data.get('river_name')
+        info = data.get('info', '')
+        land_use = data.get('land_use') or 'urban'
+        image_filename = None if is_multipart else data.get('image')
+        
+        # Reject bad input before anything is written to disk
+        try:
             latitude = float(data.get('latitude'))
             longitude = float(data.get('longitude'))
-            info = data.get('info', '')
-            land_use = data.get('land_use', 'urban')
-            image_filename = data.get('image')
+        except (TypeError, ValueError):
+            return jsonify({'success': False, 'error': 'Invalid latitude or longitude'}), 400
+        if not river_name:
+            return jsonify({'success': False, 'error': 'River name is required'}), 400
+        if land_use not in LAND_USES:
+            return jsonify({'success': False, 'error': 'Invalid land use'}), 400
+        
+        upload = None
+        file = request.files.get('river_image') if is_multipart else None
+        if file and file.filename and allowed_file(file.filename):
+            ext = file.filename.rsplit('.', 1)[1].lower()
+            safe_name = secure_filename(river_name.replace(' ', ''))
+            image_filename = f"{safe_name}.{ext}"
+            
+            file_path = os.path.join(app.config['UPLOAD_FOLDER'], image_filename)
+            upload = upload_executor.submit(save_upload, file, file_path)
         
         river = River(
             name=river_name,
@@ -752,7 +1229,10 @@ def add_river():
             admin_id=current_user.id
         )
         db.session.add(river)
+        if upload:
+            upload.result(timeout=UPLOAD_WRITE_TIMEOUT)
         db.session.commit()
+        invalidate_rivers_cache()
         
         return jsonify({'success': True, 'river': river.to_dict()})
         
@@ -776,7 +1256,8 @@ def migrate_data():
 def edit_river(river_id):
     """Edit river details (admin only)"""
     try:
-        river = River.query.get(river_id)
+        upload = None
+        river = db.session.get(River, river_id)
         if not river:
             return jsonify({'success': False, 'error': 'River not found'}), 404
         
@@ -793,9 +1274,8 @@ def edit_river(river_id):
                     safe_name = secure_filename(river.name.replace(' ', ''))
                     image_filename = f"{safe_name}.{ext}"
                     
-                    os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
                     file_path = os.path.join(app.config['UPLOAD_FOLDER'], image_filename)
-                    file.save(file_path)
+                    upload = upload_executor.submit(save_upload, file, file_path)
                     river.image = image_filename
         else:
             data = request.get_json()
@@ -806,7 +1286,10 @@ def edit_river(river_id):
             if data.get('image'):
                 river.image = data.get('image')
         
+        if upload:
+            upload.result(timeout=UPLOAD_WRITE_TIMEOUT)
         db.session.commit()
+        invalidate_rivers_cache()
         return jsonify({'success': True, 'river': river.to_dict()})
         
     except Exception as e:
@@ -818,7 +1301,7 @@ def edit_river(river_id):
 def delete_river(river_id):
     """Delete river (admin only)"""
     try:
-        river = River.query.get(river_id)
+        river = db.session.get(River, river_id)
         if not river:
             return jsonify({'success': False, 'error': 'River not found'}), 404
         
@@ -828,6 +1311,8 @@ def delete_river(river_id):
         # Delete the river
         db.session.delete(river)
         db.session.commit()
+        invalidate_rivers_cache()
+        invalidate_admin_listings()
         
         return jsonify({'success': True, 'message': f'River "{river.name}" deleted successfully'})
         
@@ -858,7 +1343,7 @@ def get_all_users():
 def get_user(user_id):
     """Get single NGO user details (admin only)"""
     try:
-        user = User.query.get(user_id)
+        user = db.session.get(User, user_id)
         if not user:
             return jsonify({'success': False, 'error': 'User not found'}), 404
         return jsonify({'success': True, 'user': user.to_dict()})
@@ -870,7 +1355,7 @@ def get_user(user_id):
 def edit_user(user_id):
     """Edit NGO user details (admin only)"""
     try:
-        user = User.query.get(user_id)
+        user = db.session.get(User, user_id)
         if not user:
             return jsonify({'success': False, 'error': 'User not found'}), 404
         
@@ -898,13 +1383,14 @@ def edit_user(user_id):
 def delete_user(user_id):
     """Delete NGO user (admin only)"""
     try:
-        user = User.query.get(user_id)
+        user = db.session.get(User, user_id)
         if not user:
             return jsonify({'success': False, 'error': 'User not found'}), 404
         
         ngo_name = user.ngo_name
         db.session.delete(user)
         db.session.commit()
+        invalidate_admin_listings()
         
         return jsonify({'success': True, 'message': f'User "{ngo_name}" deleted successfully'})
         
@@ -917,7 +1403,7 @@ def delete_user(user_id):
 def toggle_user_status(user_id):
     """Toggle NGO user active status (admin only)"""
     try:
-        user = User.query.get(user_id)
+        user = db.session.get(User, user_id)
         if not user:
             return jsonify({'success': False, 'error': 'User not found'}), 404
         
@@ -936,7 +1422,7 @@ def toggle_user_status(user_id):
 def verify_user(user_id):
     """Toggle NGO user verification status (admin only)"""
     try:
-        user = User.query.get(user_id)
+        user = db.session.get(User, user_id)
         if not user:
             return jsonify({'success': False, 'error': 'User not found'}), 404
         
@@ -1019,6 +1505,8 @@ def clear_rivers():
         # Delete all rivers
         River.query.delete()
         db.session.commit()
+        invalidate_rivers_cache()
+        invalidate_admin_listings()
         return jsonify({'message': 'All rivers and DRI readings deleted. Map is now clean.'})
     except Exception as e:
         db.session.rollback()
@@ -1035,15 +1523,11 @@ def get_all_reports_for_hotspots():
         return jsonify({'success': False, 'error': 'Unauthorized'}), 401
 
     try:
-        rivers = River.query.all()
-        all_reports = []
-        
-        for river in rivers:
-            reports = HotspotReport.query.filter_by(river_id=river.id).order_by(HotspotReport.reported_at.desc()).all()
-            if reports:
-                all_reports.extend([r.to_dict() for r in reports])
-                
-        all_reports.sort(key=lambda x: x.get('reported_at', ''), reverse=True)
+        reports = HotspotReport.query.options(
+            selectinload(HotspotReport.user),
+            selectinload(HotspotReport.river)
+        ).order_by(HotspotReport.reported_at.desc()).all()
+        all_reports = [r.to_dict() for r in reports]
                 
         return jsonify({
             'success': True,
@@ -1058,12 +1542,28 @@ def get_all_reports_for_hotspots():
 def get_my_reports():
     """Get all debris reports by current NGO user"""
     try:
-        reports = HotspotReport.query.filter_by(user_id=current_user.id).order_by(HotspotReport.reported_at.desc()).all()
-        return jsonify({
-            'success': True,
-            'reports': [r.to_dict() for r in reports],
-            'total': len(reports)
-        })
+        # Reports are only inserted, deleted or reviewed, so the ETag covers
+        # the review columns and river names as stored, read without
+        # building ORM objects; the NGO name comes from current_user
+        state = db.session.execute(
+            select(HotspotReport.id, HotspotReport.status, HotspotReport.admin_notes,
+                   HotspotReport.reviewed_at, River.name)
+            .outerjoin(River, HotspotReport.river_id == River.id)
+            .where(HotspotReport.user_id == current_user.id)
+            .order_by(HotspotReport.id)
+        ).all()
+        
+        def build():
+            reports = HotspotReport.query.options(
+                selectinload(HotspotReport.river)
+            ).filter_by(user_id=current_user.id).order_by(HotspotReport.reported_at.desc()).all()
+            return {
+                'success': True,
+                'reports': [r.to_dict() for r in reports],
+                'total': len(reports)
+            }
+        
+        return conditional_json((current_user.id, current_user.ngo_name, state), build)
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
 
@@ -1079,44 +1579,38 @@ def submit_hotspot_report():
             except ValueError:
                 return 0.0
 
-        if request.content_type and 'multipart/form-data' in request.content_type:
-            river_id = int(request.form.get('river_id'))
-            plastic_amount = safe_float(request.form.get('plastic_amount'))
-            organic_amount = safe_float(request.form.get('organic_amount'))
-            household_amount = safe_float(request.form.get('household_amount'))
-            industrial_amount = safe_float(request.form.get('industrial_amount'))
-            others_amount = safe_float(request.form.get('others_amount'))
-            
-            description = request.form.get('description', '')
-            latitude = request.form.get('latitude')
-            longitude = request.form.get('longitude')
-            sighting_date = request.form.get('sighting_date')
-            
-            photo_filename = None
-            if 'photo' in request.files:
-                file = request.files['photo']
-                if file and file.filename and allowed_file(file.filename):
-                    ext = file.filename.rsplit('.', 1)[1].lower()
-                    photo_filename = f"report_{current_user.id}_{datetime.now().strftime('%Y%m%d%H%M%S')}.{ext}"
-                    
-                    report_folder = os.path.join('static', 'img', 'reports')
-                    os.makedirs(report_folder, exist_ok=True)
-                    file_path = os.path.join(report_folder, photo_filename)
-                    file.save(file_path)
-        else:
-            data = request.get_json()
+        is_multipart = bool(request.content_type and 'multipart/form-data' in request.content_type)
+        data = request.form if is_multipart else (request.get_json(silent=True) or {})
+        
+        # Validate client input before touching the database or the disk
+        try:
             river_id = int(data.get('river_id'))
-            plastic_amount = safe_float(data.get('plastic_amount'))
-            organic_amount = safe_float(data.get('organic_amount'))
-            household_amount = safe_float(data.get('household_amount'))
-            industrial_amount = safe_float(data.get('industrial_amount'))
-            others_amount = safe_float(data.get('others_amount'))
-            
-            description = data.get('description', '')
-            latitude = data.get('latitude')
-            longitude = data.get('longitude')
-            sighting_date = data.get('sighting_date')
-            photo_filename = None
+            latitude = float(data['latitude']) if data.get('latitude') else None
+            longitude = float(data['longitude']) if data.get('longitude') else None
+            sighting_date = datetime.strptime(data['sighting_date'], '%Y-%m-%d') if data.get('sighting_date') else None
+        except (TypeError, ValueError):
+            return jsonify({'success': False, 'error': 'Invalid river, coordinates or sighting date'}), 400
+        
+        river = db.session.get(River, river_id)
+        if not river:
+            return jsonify({'success': False, 'error': 'River not found'}), 404
+        
+        plastic_amount = safe_float(data.get('plastic_amount'))
+        organic_amount = safe_float(data.get('organic_amount'))
+        household_amount = safe_float(data.get('household_amount'))
+        industrial_amount = safe_float(data.get('industrial_amount'))
+        others_amount = safe_float(data.get('others_amount'))
+        description = data.get('description', '')
+        
+        photo_filename = None
+        if is_multipart and 'photo' in request.files:
+            file = request.files['photo']
+            if file and file.filename and allowed_file(file.filename):
+                ext = file.filename.rsplit('.', 1)[1].lower()
+                photo_filename = f"report_{current_user.id}_{secrets.token_hex(8)}.{ext}"
+                
+                file_path = os.path.join(app.config['REPORT_UPLOAD_FOLDER'], photo_filename)
+                save_upload(file, file_path)
             
         # Calculate total and primary type
         amounts = {
@@ -1168,29 +1662,25 @@ def submit_hotspot_report():
             snapshot_estimated_payload=snapshot_estimated_payload,
             description=description,
             photo=photo_filename,
-            latitude=float(latitude) if latitude else None,
-            longitude=float(longitude) if longitude else None,
-            sighting_date=datetime.strptime(sighting_date, '%Y-%m-%d') if sighting_date else None
+            latitude=latitude,
+            longitude=longitude,
+            sighting_date=sighting_date
         )
         db.session.add(report)
-        db.session.commit()
+        db.session.flush()  # Get the report ID for the alerts
+        
+        # Generate Alerts for NGO Watchlist users with one INSERT ... SELECT
+        # over the watchlist, in the same transaction as the report; the
+        # watcher rows never travel to Python and back
+        message = f'A new {primary_type} hotspot report was submitted for {river.name}.'
+        db.session.execute(insert(Alert).from_select(
+            ['user_id', 'alert_type', 'title', 'message', 'river_id', 'report_id'],
+            select(
+                Watchlist.user_id, literal('new_report'), literal('New Hotspot Report'),
+                literal(message), literal(river_id), literal(report.id)
+            ).where(Watchlist.river_id == river_id, Watchlist.user_id != current_user.id)
+        ))
         
-        # Generate Alerts for NGO Watchlist users
-        ngo_watchers = Watchlist.query.filter_by(river_id=river_id).all()
-        for w in ngo_watchers:
-            if w.user_id != current_user.id:
-                alert = Alert(
-                    user_id=w.user_id,
-                    alert_type='new_report',
-                    title='New Hotspot Report',
-                    message=f'A new {debris_type} hotspot report was submitted for {report.river.name}.',
-                    river_id=river_id,
-                    report_id=report.id
-                )
-                db.session.add(alert)
-                
-        # Regular Watchlist functionality not yet implemented
-            
         db.session.commit()
         
         return jsonify({'success': True, 'report': report.to_dict()})
@@ -1225,6 +1715,9 @@ def admin_add_hotspot_report():
         latitude = data.get('latitude')
         longitude = data.get('longitude')
         
+        if debris_type not in DEBRIS_TYPES or estimated_amount not in DEBRIS_AMOUNTS:
+            return jsonify({'success': False, 'error': 'Invalid debris type or amount'}), 400
+        
         photo_filename = None
         if 'photo' in request.files:
             file = request.files['photo']
@@ -1233,7 +1726,7 @@ def admin_add_hotspot_report():
                 # Extract secure_filename module or reuse if imported
                 photo_filename = filename
                 file_path = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-                file.save(file_path)
+                save_upload(file, file_path)
 
         new_report = HotspotReport(
             river_id=river_id,
@@ -1242,7 +1735,7 @@ def admin_add_hotspot_report():
             debris_type=debris_type,
             estimated_amount=estimated_amount,
             description=description,
-            photo_url=photo_filename,
+            photo=photo_filename,
             status='reviewed'  # auto-reviewed since admin made it
         )
         db.session.add(new_report)
@@ -1262,12 +1755,29 @@ def admin_add_hotspot_report():
 def get_watchlist():
     """Get NGO user's river watchlist"""
     try:
-        watchlist = Watchlist.query.filter_by(user_id=current_user.id).all()
-        return jsonify({
-            'success': True,
-            'watchlist': [w.to_dict() for w in watchlist],
-            'total': len(watchlist)
-        })
+        # Entries are only added or removed, so the ETag covers their ids
+        # plus the editable river columns and admin name River.to_dict() shows
+        state = db.session.execute(
+            select(Watchlist.id, River.name, River.latitude, River.longitude, River.info,
+                   River.image, River.admin_id, River.state, River.district, River.land_use,
+                   Admin.name)
+            .outerjoin(River, Watchlist.river_id == River.id)
+            .outerjoin(Admin, River.admin_id == Admin.id)
+            .where(Watchlist.user_id == current_user.id)
+            .order_by(Watchlist.id)
+        ).all()
+        
+        def build():
+            watchlist = Watchlist.query.options(
+                selectinload(Watchlist.river).selectinload(River.added_by_admin)
+            ).filter_by(user_id=current_user.id).all()
+            return {
+                'success': True,
+                'watchlist': [w.to_dict() for w in watchlist],
+                'total': len(watchlist)
+            }
+        
+        return conditional_json((current_user.id, state), build)
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
 
@@ -1279,21 +1789,23 @@ def add_to_watchlist():
         data = request.get_json()
         river_id = int(data.get('river_id'))
         
-        # Check if already in watchlist
-        existing = Watchlist.query.filter_by(user_id=current_user.id, river_id=river_id).first()
-        if existing:
+        # The unique (user_id, river_id) constraint decides in the same
+        # statement whether the river was already watched
+        watch_id = db.session.execute(
+            insert_ignoring_duplicates(Watchlist).values(
+                user_id=current_user.id,
+                river_id=river_id,
+                alert_on_high=data.get('alert_on_high', True),
+                alert_on_critical=data.get('alert_on_critical', True),
+                email_alerts=data.get('email_alerts', False)
+            ).on_conflict_do_nothing(index_elements=['user_id', 'river_id']).returning(Watchlist.id)
+        ).scalar()
+        if watch_id is None:
             return jsonify({'success': False, 'error': 'River already in watchlist'}), 400
-        
-        watch = Watchlist(
-            user_id=current_user.id,
-            river_id=river_id,
-            alert_on_high=data.get('alert_on_high', True),
-            alert_on_critical=data.get('alert_on_critical', True),
-            email_alerts=data.get('email_alerts', False)
-        )
-        db.session.add(watch)
         db.session.commit()
         
+        watch = db.session.get(Watchlist, watch_id,
+                               options=[joinedload(Watchlist.river).joinedload(River.added_by_admin)])
         return jsonify({'success': True, 'watchlist_item': watch.to_dict()})
         
     except Exception as e:
@@ -1308,11 +1820,13 @@ def remove_from_watchlist():
         data = request.get_json()
         river_id = int(data.get('river_id'))
         
-        watch = Watchlist.query.filter_by(user_id=current_user.id, river_id=river_id).first()
-        if not watch:
+        # Delete directly; the row count tells us whether it was watched
+        deleted = Watchlist.query.filter_by(
+            user_id=current_user.id, river_id=river_id
+        ).delete(synchronize_session=False)
+        if not deleted:
             return jsonify({'success': False, 'error': 'River not in watchlist'}), 404
         
-        db.session.delete(watch)
         db.session.commit()
         
         return jsonify({'success': True, 'message': 'Removed from watchlist'})
@@ -1359,16 +1873,18 @@ def submit_location_request():
     """Submit a request for new monitoring location"""
     try:
         data = request.form
+        land_use = data.get('land_use') or 'urban'
+        if land_use not in LAND_USES:
+            return jsonify({'success': False, 'error': 'Invalid land use'}), 400
         
         # Handle file upload
         filename = None
         if 'photo' in request.files:
             file = request.files['photo']
             if file and file.filename != '' and allowed_file(file.filename):
-                filename = secure_filename(f"req_{datetime.utcnow().strftime('%Y%m%d%H%M%S')}_{file.filename}")
+                filename = secure_filename(f"req_{secrets.token_hex(8)}_{file.filename}")
                 file_path = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-                os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
-                file.save(file_path)
+                save_upload(file, file_path)
         
         loc_request = LocationRequest(
             user_id=current_user.id,
@@ -1377,7 +1893,7 @@ def submit_location_request():
             longitude=float(data.get('longitude')),
             state=data.get('state'),
             district=data.get('district'),
-            land_use=data.get('land_use', 'urban'),
+            land_use=land_use,
             reason=data.get('reason'),
             additional_info=data.get('additional_info', ''),
             photo=filename
@@ -1395,6 +1911,34 @@ def submit_location_request():
 # NGO API - Historical Data & Export
 # ============================================
 
+CSV_EXPORT_CHUNK_ROWS = 1000
+
+# Columns of DRIReading.to_dict(); history serializes these rows directly
+READING_COLUMNS = (
+    DRIReading.id, DRIReading.river_id, DRIReading.dri_score, DRIReading.risk_level,
+    DRIReading.rainfall, DRIReading.wind_speed, DRIReading.tide_level,
+    DRIReading.water_flow, DRIReading.estimated_debris_kg, DRIReading.recorded_at
+)
+CSV_EXPORT_COLUMNS = (
+    DRIReading.recorded_at, DRIReading.dri_score, DRIReading.risk_level,
+    DRIReading.rainfall, DRIReading.wind_speed, DRIReading.tide_level,
+    DRIReading.water_flow, DRIReading.estimated_debris_kg
+)
+
+def csv_export_row(river_name, r):
+    """CSV row for a CSV_EXPORT_COLUMNS reading row"""
+    return (
+        river_name,
+        r.recorded_at.isoformat(sep=' ', timespec='minutes') if r.recorded_at else '',
+        r.dri_score,
+        r.risk_level,
+        r.rainfall,
+        r.wind_speed,
+        r.tide_level,
+        r.water_flow,
+        r.estimated_debris_kg
+    )
+
 @app.route('/api/ngo/river/<int:river_id>/history', methods=['GET'])
 @ngo_required
 def get_river_history(river_id):
@@ -1402,26 +1946,37 @@ def get_river_history(river_id):
     try:
         # Get optional date range
         days = request.args.get('days', 30, type=int)
-        from datetime import timedelta
         start_date = datetime.utcnow() - timedelta(days=days)
-        
-        readings = DRIReading.query.filter(
+        in_range = DRIReading.query.filter(
             DRIReading.river_id == river_id,
             DRIReading.recorded_at >= start_date
-        ).order_by(DRIReading.recorded_at.asc()).all()
-        
-        river = River.query.get(river_id)
-        
-        return jsonify({
-            'success': True,
-            'river_name': river.name if river else None,
-            'readings': [r.to_dict() for r in readings],
-            'total': len(readings),
-            'date_range': {
-                'start': start_date.strftime('%Y-%m-%d'),
-                'end': datetime.utcnow().strftime('%Y-%m-%d')
+        )
+        river = db.session.get(River, river_id)
+        
+        # Readings are append-only: the window's count and newest id change
+        # whenever a reading enters or ages out of it
+        state = in_range.with_entities(func.count(DRIReading.id), func.max(DRIReading.id)).one()
+        fingerprint = (river_id, days, river.name if river else None,
+                       start_date.strftime('%Y-%m-%d'), datetime.utcnow().strftime('%Y-%m-%d'), *state)
+        
+        def build():
+            readings = []
+            for row in in_range.with_entities(*READING_COLUMNS).order_by(DRIReading.recorded_at.asc()):
+                reading = row._asdict()
+                reading['recorded_at'] = format_datetime(row.recorded_at)
+                readings.append(reading)
+            return {
+                'success': True,
+                'river_name': river.name if river else None,
+                'readings': readings,
+                'total': len(readings),
+                'date_range': {
+                    'start': start_date.strftime('%Y-%m-%d'),
+                    'end': datetime.utcnow().strftime('%Y-%m-%d')
+                }
             }
-        })
+        
+        return conditional_json(fingerprint, build)
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
 
@@ -1430,48 +1985,40 @@ def get_river_history(river_id):
 def export_river_data(river_id):
     """Export river DRI data as CSV"""
     try:
-        import csv
-        from io import StringIO
-        from flask import Response
-        
         days = request.args.get('days', 30, type=int)
-        from datetime import timedelta
         start_date = datetime.utcnow() - timedelta(days=days)
         
-        readings = DRIReading.query.filter(
+        readings = select(*CSV_EXPORT_COLUMNS).where(
             DRIReading.river_id == river_id,
             DRIReading.recorded_at >= start_date
-        ).order_by(DRIReading.recorded_at.desc()).all()
-        
-        river = River.query.get(river_id)
-        
-        # Create CSV
-        output = StringIO()
-        writer = csv.writer(output)
-        
-        # Header
-        writer.writerow(['River Name', 'Date/Time', 'DRI Score', 'Risk Level', 
-                        'Rainfall (mm)', 'Wind Speed (kph)', 'Tide Level (m)', 
-                        'Water Flow (m³/s)', 'Estimated Debris (kg)'])
-        
-        # Data rows
-        for r in readings:
-            writer.writerow([
-                river.name if river else 'Unknown',
-                r.recorded_at.strftime('%Y-%m-%d %H:%M') if r.recorded_at else '',
-                r.dri_score,
-                r.risk_level,
-                r.rainfall,
-                r.wind_speed,
-                r.tide_level,
-                r.water_flow,
-                r.estimated_debris_kg
-            ])
-        
-        output.seek(0)
+        ).order_by(DRIReading.recorded_at.desc())
+        
+        river = db.session.get(River, river_id)
+        river_name = river.name if river else 'Unknown'
+        
+        def generate():
+            # Stream the CSV in CSV_EXPORT_CHUNK_ROWS-row chunks so memory
+            # stays bounded and the download starts immediately
+            output = StringIO()
+            writer = csv.writer(output)
+            
+            # Header
+            writer.writerow(['River Name', 'Date/Time', 'DRI Score', 'Risk Level', 
+                            'Rainfall (mm)', 'Wind Speed (kph)', 'Tide Level (m)', 
+                            'Water Flow (m³/s)', 'Estimated Debris (kg)'])
+            
+            # Data rows
+            result = db.session.execute(readings.execution_options(yield_per=CSV_EXPORT_CHUNK_ROWS))
+            for rows in result.partitions():
+                writer.writerows(csv_export_row(river_name, r) for r in rows)
+                yield output.getvalue()
+                output.seek(0)
+                output.truncate()
+            
+            yield output.getvalue()
         
         return Response(
-            output.getvalue(),
+            stream_with_context(generate()),
             mimetype='text/csv',
             headers={
                 'Content-Disposition': f'attachment; filename={river.name if river else "river"}_dri_data.csv'
@@ -1486,49 +2033,41 @@ def export_river_data(river_id):
 def export_watchlist_data():
     """Export all watchlist rivers' data as CSV"""
     try:
-        import csv
-        from io import StringIO
-        from flask import Response
-        
-        watchlist = Watchlist.query.filter_by(user_id=current_user.id).all()
-        river_ids = [w.river_id for w in watchlist]
+        river_ids = Watchlist.query.filter_by(user_id=current_user.id).with_entities(Watchlist.river_id)
         
         days = request.args.get('days', 7, type=int)
-        from datetime import timedelta
         start_date = datetime.utcnow() - timedelta(days=days)
         
-        readings = DRIReading.query.filter(
+        readings = select(River.name, *CSV_EXPORT_COLUMNS).outerjoin(
+            River, DRIReading.river_id == River.id
+        ).where(
             DRIReading.river_id.in_(river_ids),
             DRIReading.recorded_at >= start_date
-        ).order_by(DRIReading.recorded_at.desc()).all()
-        
-        # Create CSV
-        output = StringIO()
-        writer = csv.writer(output)
-        
-        # Header
-        writer.writerow(['River Name', 'Date/Time', 'DRI Score', 'Risk Level', 
-                        'Rainfall (mm)', 'Wind Speed (kph)', 'Tide Level (m)', 
-                        'Water Flow (m³/s)', 'Estimated Debris (kg)'])
-        
-        # Data rows
-        for r in readings:
-            writer.writerow([
-                r.river.name if r.river else 'Unknown',
-                r.recorded_at.strftime('%Y-%m-%d %H:%M') if r.recorded_at else '',
-                r.dri_score,
-                r.risk_level,
-                r.rainfall,
-                r.wind_speed,
-                r.tide_level,
-                r.water_flow,
-                r.estimated_debris_kg
-            ])
-        
-        output.seek(0)
+        ).order_by(DRIReading.recorded_at.desc())
+        
+        def generate():
+            # Stream the CSV in CSV_EXPORT_CHUNK_ROWS-row chunks so memory
+            # stays bounded and the download starts immediately
+            output = StringIO()
+            writer = csv.writer(output)
+            
+            # Header
+            writer.writerow(['River Name', 'Date/Time', 'DRI Score', 'Risk Level', 
+                            'Rainfall (mm)', 'Wind Speed (kph)', 'Tide Level (m)', 
+                            'Water Flow (m³/s)', 'Estimated Debris (kg)'])
+            
+            # Data rows
+            result = db.session.execute(readings.execution_options(yield_per=CSV_EXPORT_CHUNK_ROWS))
+            for rows in result.partitions():
+                writer.writerows(csv_export_row(r.name or 'Unknown', r) for r in rows)
+                yield output.getvalue()
+                output.seek(0)
+                output.truncate()
+            
+            yield output.getvalue()
         
         return Response(
-            output.getvalue(),
+            stream_with_context(generate()),
             mimetype='text/csv',
             headers={
                 'Content-Disposition': f'attachment; filename=watchlist_dri_data.csv'
@@ -1542,6 +2081,13 @@ def export_watchlist_data():
 # NGO API - Alerts/Notifications
 # ============================================
 
+# Columns of Alert.to_dict(); the alert feed serializes these rows directly
+# instead of hydrating Alert objects
+ALERT_COLUMNS = (
+    Alert.id, Alert.user_id, Alert.alert_type, Alert.title, Alert.message,
+    Alert.river_id, Alert.is_read, Alert.created_at
+)
+
 @app.route('/api/ngo/alerts', methods=['GET'])
 @ngo_required
 def get_alerts():
@@ -1549,18 +2095,38 @@ def get_alerts():
     try:
         unread_only = request.args.get('unread', 'false').lower() == 'true'
         
-        query = Alert.query.filter_by(user_id=current_user.id)
-        if unread_only:
-            query = query.filter_by(is_read=False)
-        
-        alerts = query.order_by(Alert.created_at.desc()).limit(50).all()
-        unread_count = Alert.query.filter_by(user_id=current_user.id, is_read=False).count()
+        # Alerts are only ever inserted or marked read, so count, newest id
+        # and the trigger-maintained unread counter identify the response
+        # without building it
+        unread_count = current_user.unread_alert_count
+        state = db.session.query(
+            func.count(Alert.id), func.max(Alert.id)
+        ).filter(Alert.user_id == current_user.id).one()
+        
+        def build():
+            # The window count is evaluated before LIMIT, so one round trip
+            # returns the capped page plus the total of the filtered set
+            query = db.session.query(
+                *ALERT_COLUMNS, func.count().over().label('total')
+            ).filter(Alert.user_id == current_user.id)
+            if unread_only:
+                query = query.filter(Alert.is_read.is_(False))
+            
+            rows = query.order_by(Alert.created_at.desc()).limit(50).all()
+            alerts = []
+            for row in rows:
+                alert = row._asdict()
+                del alert['total']
+                alert['created_at'] = format_datetime(row.created_at, 'minutes')
+                alerts.append(alert)
+            return {
+                'success': True,
+                'alerts': alerts,
+                'total': rows[0].total if rows else 0,
+                'unread_count': unread_count
+            }
         
-        return jsonify({
-            'success': True,
-            'alerts': [a.to_dict() for a in alerts],
-            'unread_count': unread_count
-        })
+        return conditional_json((current_user.id, unread_only, unread_count, *state), build)
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
 
@@ -1572,15 +2138,18 @@ def mark_alerts_read():
         data = request.get_json()
         alert_ids = data.get('alert_ids', [])
         
+        # One UPDATE for the whole batch; already-read alerts are skipped so
+        # their read_at is kept and the counter triggers don't fire for them
         if alert_ids:
             Alert.query.filter(
                 Alert.id.in_(alert_ids),
-                Alert.user_id == current_user.id
-            ).update({Alert.is_read: True, Alert.read_at: datetime.utcnow()}, synchronize_session=False)
+                Alert.user_id == current_user.id,
+                Alert.is_read.is_(False)
+            ).update({Alert.is_read: True, Alert.read_at: utcnow()}, synchronize_session=False)
         else:
             # Mark all as read
             Alert.query.filter_by(user_id=current_user.id, is_read=False).update(
-                {Alert.is_read: True, Alert.read_at: datetime.utcnow()}, synchronize_session=False
+                {Alert.is_read: True, Alert.read_at: utcnow()}, synchronize_session=False
             )
         
         db.session.commit()
@@ -1598,7 +2167,15 @@ def mark_alerts_read():
 @admin_required
 def admin_reports():
     """Admin page to review debris reports"""
-    reports = HotspotReport.query.order_by(HotspotReport.reported_at.desc()).all()
+    # The table only shows these columns; description, notes and snapshots
+    # are fetched by the detail modal through /api/admin/reports
+    reports = HotspotReport.query.options(
+        load_only(HotspotReport.id, HotspotReport.user_id, HotspotReport.river_id,
+                  HotspotReport.debris_type, HotspotReport.estimated_amount,
+                  HotspotReport.reported_at, HotspotReport.status, raiseload=True),
+        joinedload(HotspotReport.river).load_only(River.name, raiseload=True),
+        joinedload(HotspotReport.user).load_only(User.ngo_name, raiseload=True)
+    ).order_by(HotspotReport.reported_at.desc()).all()
     return render_template('admin_reports.html', reports=reports, admin=current_user)
 
 @app.route('/admin/hotspot-reports')
@@ -1622,25 +2199,77 @@ def public_hotspot_reports():
 @admin_required
 def admin_location_requests():
     """Admin page to review location requests"""
-    requests_list = LocationRequest.query.order_by(LocationRequest.requested_at.desc()).all()
+    # The table only shows these columns; reason, additional info and the
+    # admin response are fetched by the detail modal through /api/admin/requests
+    requests_list = LocationRequest.query.options(
+        load_only(LocationRequest.id, LocationRequest.user_id, LocationRequest.location_name,
+                  LocationRequest.latitude, LocationRequest.longitude, LocationRequest.land_use,
+                  LocationRequest.requested_at, LocationRequest.status, raiseload=True),
+        joinedload(LocationRequest.user).load_only(User.ngo_name, raiseload=True)
+    ).order_by(LocationRequest.requested_at.desc()).all()
     return render_template('admin_location_requests.html', requests=requests_list, admin=current_user)
 
+# Short-lived cache of the admin report/request listings, keyed by listing,
+# status filter and the listed table's row count, newest id and latest
+# review, read from the database on every request. Every report or request
+# write changes that state, so a review made through any worker is visible
+# on the next fetch. River and user deletes here bump
+# _admin_listing_version; renames and deletes in other workers age out
+# after ADMIN_LISTING_CACHE_TTL.
+ADMIN_LISTING_CACHE_TTL = 30
+ADMIN_LISTING_CACHE_MAX_ENTRIES = 64
+_admin_listing_cache = {}
+_admin_listing_version = 0
+
+def invalidate_admin_listings():
+    """Drop cached admin listings after a river or user is deleted"""
+    global _admin_listing_version
+    _admin_listing_version += 1
+    _admin_listing_cache.clear()
+
+def cached_admin_listing(model, status_filter, build):
+    """Return the JSON body for an admin listing of model, rebuilding it if stale"""
+    state = db.session.query(
+        func.count(model.id), func.max(model.id), func.max(model.reviewed_at)
+    ).one()
+    key = (_admin_listing_version, model.__tablename__, status_filter, *state)
+    entry = _admin_listing_cache.get(key)
+    if entry and entry['expires_at'] > time.monotonic():
+        return entry['json']
+
+    body = orjson.dumps(build())
+    if len(_admin_listing_cache) >= ADMIN_LISTING_CACHE_MAX_ENTRIES:
+        _admin_listing_cache.clear()
+    _admin_listing_cache[key] = {
+        'json': body,
+        'expires_at': time.monotonic() + ADMIN_LISTING_CACHE_TTL
+    }
+    return body
+
 @app.route('/api/admin/reports')
 @admin_required
 def get_all_reports():
     """Get all debris reports (admin)"""
     try:
         status_filter = request.args.get('status')
-        query = HotspotReport.query
-        if status_filter:
-            query = query.filter_by(status=status_filter)
+        if status_filter and status_filter not in REPORT_STATUSES:
+            return jsonify({'success': False, 'error': 'Invalid status'}), 400
         
-        reports = query.order_by(HotspotReport.reported_at.desc()).all()
-        return jsonify({
-            'success': True,
-            'reports': [r.to_dict() for r in reports],
-            'total': len(reports)
-        })
+        def build():
+            query = HotspotReport.query.options(
+                joinedload(HotspotReport.river),
+                joinedload(HotspotReport.user)
+            )
+            if status_filter:
+                query = query.filter_by(status=status_filter)
+            reports = query.order_by(HotspotReport.reported_at.desc()).all()
+            return {
+                'success': True,
+                'reports': [r.to_dict() for r in reports],
+                'total': len(reports)
+            }
+        
+        return Response(cached_admin_listing(HotspotReport, status_filter, build), mimetype='application/json')
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
 
@@ -1649,19 +2278,20 @@ def get_all_reports():
 def review_report(report_id):
     """Review a debris report"""
     try:
-        report = HotspotReport.query.get(report_id)
+        report = db.session.get(HotspotReport, report_id,
+                                options=[joinedload(HotspotReport.river), joinedload(HotspotReport.user)])
         if not report:
             return jsonify({'success': False, 'error': 'Report not found'}), 404
         
         data = request.get_json()
+        if data.get('status', report.status) not in REPORT_STATUSES:
+            return jsonify({'success': False, 'error': 'Invalid status'}), 400
         report.status = data.get('status', report.status)
         report.admin_notes = data.get('admin_notes', report.admin_notes)
         report.reviewed_by = current_user.id
         report.reviewed_at = datetime.utcnow()
         
-        db.session.commit()
-        
-        # Create alert for the NGO user
+        # Create alert for the NGO user in the same transaction as the review
         alert = Alert(
             user_id=report.user_id,
             alert_type='report_reviewed',
@@ -1685,16 +2315,21 @@ def get_all_location_requests():
     """Get all location requests (admin)"""
     try:
         status_filter = request.args.get('status')
-        query = LocationRequest.query
-        if status_filter:
-            query = query.filter_by(status=status_filter)
+        if status_filter and status_filter not in REQUEST_STATUSES:
+            return jsonify({'success': False, 'error': 'Invalid status'}), 400
+        
+        def build():
+            query = LocationRequest.query.options(joinedload(LocationRequest.user))
+            if status_filter:
+                query = query.filter_by(status=status_filter)
+            requests_list = query.order_by(LocationRequest.requested_at.desc()).all()
+            return {
+                'success': True,
+                'requests': [r.to_dict() for r in requests_list],
+                'total': len(requests_list)
+            }
         
-        requests_list = query.order_by(LocationRequest.requested_at.desc()).all()
-        return jsonify({
-            'success': True,
-            'requests': [r.to_dict() for r in requests_list],
-            'total': len(requests_list)
-        })
+        return Response(cached_admin_listing(LocationRequest, status_filter, build), mimetype='application/json')
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
 
@@ -1703,13 +2338,15 @@ def get_all_location_requests():
 def review_location_request(request_id):
     """Review a location request (approve/reject)"""
     try:
-        loc_request = LocationRequest.query.get(request_id)
+        loc_request = db.session.get(LocationRequest, request_id, options=[joinedload(LocationRequest.user)])
         if not loc_request:
             return jsonify({'success': False, 'error': 'Request not found'}), 404
         
         data = request.get_json()
         new_status = data.get('status')
         admin_response = data.get('admin_response', '')
+        if new_status not in REQUEST_STATUSES:
+            return jsonify({'success': False, 'error': 'Invalid status'}), 400
         
         loc_request.status = new_status
         loc_request.admin_response = admin_response
@@ -1733,9 +2370,7 @@ def review_location_request(request_id):
             db.session.flush()  # Get the river ID
             loc_request.created_river_id = river.id
         
-        db.session.commit()
-        
-        # Create alert for the NGO user
+        # Create alert for the NGO user in the same transaction
         alert_message = f'Your location request for "{loc_request.location_name}" has been {new_status}.'
         if admin_response:
             alert_message += f' Admin response: {admin_response}'
@@ -1749,6 +2384,8 @@ def review_location_request(request_id):
         )
         db.session.add(alert)
         db.session.commit()
+        if new_status == 'approved':
+            invalidate_rivers_cache()
         
         return jsonify({'success': True, 'request': loc_request.to_dict()})
         
@@ -1837,4 +2474,5 @@ def server_error(e):
     return render_template('500.html'), 500
 
 if __name__ == '__main__':
+    init_db()
     app.run(debug=True, host='0.0.0.0', port=5000)
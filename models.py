@@ -3,13 +3,122 @@ DebriSense Database Models
 Using Flask-SQLAlchemy with PostgreSQL (Supabase)
 """
 
+import os
+import operator
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
 from flask_sqlalchemy import SQLAlchemy
 from flask_login import UserMixin
-from datetime import datetime
-from werkzeug.security import generate_password_hash, check_password_hash
+from sqlalchemy import event
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import FunctionElement
+from werkzeug.security import check_password_hash
+from argon2 import PasswordHasher
+from argon2.exceptions import InvalidHashError, VerificationError
 
 db = SQLAlchemy()
 
+# to_dict() timestamp formatting. isoformat() produces the same text as the
+# equivalent strftime() patterns for naive datetimes without parsing a format.
+def format_datetime(dt, timespec='seconds'):
+    """'YYYY-MM-DD HH:MM:SS' (or 'YYYY-MM-DD HH:MM' with timespec='minutes'), or None"""
+    return dt.isoformat(sep=' ', timespec=timespec) if dt else None
+
+def format_date(dt):
+    """'YYYY-MM-DD' for a datetime, or None"""
+    return dt.date().isoformat() if dt else None
+
+# Database-side default for creation timestamps: naive UTC, the same values
+# datetime.utcnow() produces, whatever the server's time zone setting. The
+# columns keep their Python default as well, since tables created before the
+# server default existed (SQLite can't add one in place) have no DEFAULT.
+class utcnow(FunctionElement):
+    """Current UTC time as a naive timestamp, evaluated by the database"""
+    type = db.DateTime()
+    inherit_cache = True
+
+@compiles(utcnow)
+def _utcnow_default(element, compiler, **kw):
+    return 'CURRENT_TIMESTAMP'
+
+@compiles(utcnow, 'postgresql')
+def _utcnow_postgresql(element, compiler, **kw):
+    return "TIMEZONE('utc', CURRENT_TIMESTAMP)"
+
+@compiles(utcnow, 'sqlite')
+def _utcnow_sqlite(element, compiler, **kw):
+    return "STRFTIME('%Y-%m-%d %H:%M:%f', 'now')"
+
+# New passwords are hashed with Argon2id. Werkzeug (scrypt/pbkdf2) hashes
+# from older accounts still verify and are upgraded on the next login.
+password_hasher = PasswordHasher(time_cost=3, memory_cost=65536, parallelism=2)
+
+def _verify_password(password_hash, password):
+    """Check a password against a stored hash; returns (matches, needs_rehash)"""
+    if not password_hash.startswith('$argon2'):
+        return check_password_hash(password_hash, password), True
+    try:
+        password_hasher.verify(password_hash, password)
+    except (VerificationError, InvalidHashError):
+        return False, False
+    return True, password_hasher.check_needs_rehash(password_hash)
+
+# Password checks run on a pool sized to the CPU count, with at most
+# HASH_QUEUE_LIMIT admitted at once, so a login burst is turned away early
+# instead of queueing behind hashes and letting every request's latency grow.
+HASH_WORKERS = os.cpu_count() or 1
+HASH_QUEUE_LIMIT = HASH_WORKERS * 2
+HASH_TIMEOUT = 2.0  # seconds
+_hash_pool = ThreadPoolExecutor(max_workers=HASH_WORKERS, thread_name_prefix='argon2')
+_hash_slots = threading.BoundedSemaphore(HASH_QUEUE_LIMIT)
+
+class PasswordCheckBusy(Exception):
+    """Raised when HASH_QUEUE_LIMIT password checks are already in flight"""
+
+def verify_password(password_hash, password):
+    """Check a password on the hash pool; returns (matches, needs_rehash).
+    Raises PasswordCheckBusy when the pool is saturated and TimeoutError
+    when the check takes longer than HASH_TIMEOUT."""
+    if not _hash_slots.acquire(blocking=False):
+        raise PasswordCheckBusy()
+    try:
+        future = _hash_pool.submit(_verify_password, password_hash, password)
+    except Exception:
+        _hash_slots.release()
+        raise
+    future.add_done_callback(lambda _: _hash_slots.release())
+    return future.result(timeout=HASH_TIMEOUT)
+
+# Research-based debris profiles for Malaysian rivers, keyed by land use.
+# Shared read-only: callers that adjust a profile must copy it first.
+DEBRIS_PROFILES = {
+    'urban': {'plastic': 55, 'organic': 20, 'household': 15, 'industrial': 5, 'others': 5},
+    'industrial': {'plastic': 35, 'organic': 10, 'household': 10, 'industrial': 35, 'others': 10},
+    'rural': {'plastic': 25, 'organic': 45, 'household': 15, 'industrial': 5, 'others': 10},
+    # 'others' includes fishing gear and marine debris
+    'coastal': {'plastic': 40, 'organic': 20, 'household': 10, 'industrial': 10, 'others': 20},
+    'mixed': {'plastic': 45, 'organic': 25, 'household': 15, 'industrial': 10, 'others': 5}
+}
+
+def debris_profile_for(land_use):
+    """Debris profile for a land use, falling back to 'urban'"""
+    return DEBRIS_PROFILES.get(land_use) or DEBRIS_PROFILES['urban']
+
+# Fixed vocabularies of the categorical columns. On PostgreSQL they are
+# native ENUM types (4 bytes, compared as integers), elsewhere short VARCHARs.
+LAND_USES = tuple(DEBRIS_PROFILES)
+DEBRIS_TYPES = ('plastic', 'organic', 'household', 'industrial', 'others', 'mixed')
+DEBRIS_AMOUNTS = ('small', 'medium', 'large', 'massive')
+REPORT_STATUSES = ('pending', 'reviewed', 'resolved')
+REQUEST_STATUSES = ('pending', 'approved', 'rejected')
+
+land_use_enum = db.Enum(*LAND_USES, name='land_use')
+debris_type_enum = db.Enum(*DEBRIS_TYPES, name='debris_type')
+debris_amount_enum = db.Enum(*DEBRIS_AMOUNTS, name='debris_amount')
+report_status_enum = db.Enum(*REPORT_STATUSES, name='report_status')
+request_status_enum = db.Enum(*REQUEST_STATUSES, name='request_status')
+
 
 class Admin(UserMixin, db.Model):
     """Admin model for system administrators"""
@@ -20,26 +129,39 @@ class Admin(UserMixin, db.Model):
     password_hash = db.Column(db.String(256), nullable=False)
     name = db.Column(db.String(150), nullable=False, default='Admin')
     is_active = db.Column(db.Boolean, default=True)
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, server_default=utcnow())
     last_login = db.Column(db.DateTime, nullable=True)
     
-    # Relationship to rivers added by admin
-    rivers = db.relationship('River', backref='added_by_admin', lazy='dynamic', 
-                            foreign_keys='River.admin_id')
-    hotspot_reports = db.relationship('HotspotReport', backref='reviewer', lazy='dynamic',
-                                     foreign_keys='HotspotReport.reviewed_by')
+    # Case-insensitive uniqueness, and index for lower(email) lookups at login
+    __table_args__ = (db.Index('ix_admins_email_lower', db.func.lower(email), unique=True),)
+    
+    # Relationships. Collections are declared on both sides with
+    # back_populates; one-to-many collections are lazy='raise' since nothing
+    # should walk them row by row (query the child table instead).
+    rivers = db.relationship('River', back_populates='added_by_admin', lazy='raise')
+    hotspot_reports = db.relationship('HotspotReport', back_populates='reviewer', lazy='raise')
+    reviewed_requests = db.relationship('LocationRequest', back_populates='reviewer', lazy='raise')
     
     def set_password(self, password):
         """Hash and set password"""
-        self.password_hash = generate_password_hash(password)
+        self.password_hash = password_hasher.hash(password)
     
     def check_password(self, password):
-        """Check if password matches hash"""
-        return check_password_hash(self.password_hash, password)
+        """Check if password matches hash, upgrading outdated hashes in place"""
+        matches, needs_rehash = verify_password(self.password_hash, password)
+        if matches and needs_rehash:
+            self.set_password(password)
+        return matches
     
     def get_id(self):
-        """Override to prefix with 'admin_' for Flask-Login"""
-        return f'admin_{self.id}'
+        """Override to prefix with 'a' for Flask-Login"""
+        return f'a{self.id}'
+    
+    def count_rivers(self):
+        """Number of rivers added by this admin, counted in SQL"""
+        return db.session.scalar(
+            db.select(db.func.count(River.id)).where(River.admin_id == self.id)
+        )
     
     def to_dict(self):
         return {
@@ -47,8 +169,8 @@ class Admin(UserMixin, db.Model):
             'email': self.email,
             'name': self.name,
             'is_active': self.is_active,
-            'created_at': self.created_at.strftime('%Y-%m-%d %H:%M:%S') if self.created_at else None,
-            'rivers_count': self.rivers.count()
+            'created_at': format_datetime(self.created_at),
+            'rivers_count': self.count_rivers()
         }
     
     def __repr__(self):
@@ -68,20 +190,36 @@ class User(UserMixin, db.Model):
     profile_image = db.Column(db.String(255), nullable=True, default='default_profile.png')
     is_active = db.Column(db.Boolean, default=True)
     is_verified = db.Column(db.Boolean, default=False)
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, server_default=utcnow())
+    updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, server_default=utcnow(), onupdate=utcnow())
+    
+    # Unread alerts, kept up to date by triggers on the alerts table (see
+    # ALERT_COUNTER_SQL) so the dashboard badge never counts rows
+    unread_alert_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    
+    # Relationships
+    hotspot_reports = db.relationship('HotspotReport', back_populates='user', lazy='raise')
+    watchlist = db.relationship('Watchlist', back_populates='user', lazy='raise')
+    location_requests = db.relationship('LocationRequest', back_populates='user', lazy='raise')
+    alerts = db.relationship('Alert', back_populates='user', lazy='raise')
+    
+    # Case-insensitive uniqueness, and index for lower(email) lookups at login
+    __table_args__ = (db.Index('ix_users_email_lower', db.func.lower(email), unique=True),)
     
     def set_password(self, password):
         """Hash and set password"""
-        self.password_hash = generate_password_hash(password)
+        self.password_hash = password_hasher.hash(password)
     
     def check_password(self, password):
-        """Check if password matches hash"""
-        return check_password_hash(self.password_hash, password)
+        """Check if password matches hash, upgrading outdated hashes in place"""
+        matches, needs_rehash = verify_password(self.password_hash, password)
+        if matches and needs_rehash:
+            self.set_password(password)
+        return matches
     
     def get_id(self):
-        """Override to prefix with 'user_' for Flask-Login"""
-        return f'user_{self.id}'
+        """Override to prefix with 'u' for Flask-Login"""
+        return f'u{self.id}'
     
     def to_dict(self):
         """Convert user to dictionary (exclude sensitive data)"""
@@ -93,7 +231,7 @@ class User(UserMixin, db.Model):
             'address': self.address,
             'profile_image': self.profile_image,
             'is_verified': self.is_verified,
-            'created_at': self.created_at.strftime('%Y-%m-%d %H:%M:%S') if self.created_at else None
+            'created_at': format_datetime(self.created_at)
         }
     
     def __repr__(self):
@@ -109,9 +247,12 @@ class River(db.Model):
     latitude = db.Column(db.Float, nullable=False)
     longitude = db.Column(db.Float, nullable=False)
     info = db.Column(db.Text, nullable=True)
+    # Image file names stay on the row (like the report/request photo and
+    # profile_image columns): every listing that returns them renders them,
+    # and VARCHAR only stores the ~20-byte name, not the declared 255
     image = db.Column(db.String(255), nullable=True)
     admin_id = db.Column(db.Integer, db.ForeignKey('admins.id'), nullable=True)
-    date_added = db.Column(db.DateTime, default=datetime.utcnow)
+    date_added = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, server_default=utcnow())
     is_active = db.Column(db.Boolean, default=True)
     
     # Additional metadata
@@ -120,66 +261,33 @@ class River(db.Model):
     
     # Land use type for debris profile prediction
     # Options: urban, industrial, rural, coastal, mixed
-    land_use = db.Column(db.String(50), nullable=True, default='urban')
+    land_use = db.Column(land_use_enum, nullable=True, default='urban')
+    
+    # Relationships
+    added_by_admin = db.relationship('Admin', back_populates='rivers')
+    readings = db.relationship('DRIReading', back_populates='river', lazy='raise')
+    reports = db.relationship('HotspotReport', back_populates='river', lazy='raise')
+    watchers = db.relationship('Watchlist', back_populates='river', lazy='raise')
+    alerts = db.relationship('Alert', back_populates='river', lazy='raise')
+    request = db.relationship('LocationRequest', back_populates='created_river', uselist=False, lazy='raise')
     
     def get_debris_profile(self):
         """Get debris type distribution based on land use"""
-        # Research-based debris profiles for Malaysian rivers
-        profiles = {
-            'urban': {
-                'plastic': 55,
-                'organic': 20,
-                'household': 15,
-                'industrial': 5,
-                'others': 5
-            },
-            'industrial': {
-                'plastic': 35,
-                'organic': 10,
-                'household': 10,
-                'industrial': 35,
-                'others': 10
-            },
-            'rural': {
-                'plastic': 25,
-                'organic': 45,
-                'household': 15,
-                'industrial': 5,
-                'others': 10
-            },
-            'coastal': {
-                'plastic': 40,
-                'organic': 20,
-                'household': 10,
-                'industrial': 10,
-                'others': 20  # Includes fishing gear, marine debris
-            },
-            'mixed': {
-                'plastic': 45,
-                'organic': 25,
-                'household': 15,
-                'industrial': 10,
-                'others': 5
-            }
-        }
-        return profiles.get(self.land_use or 'urban', profiles['urban'])
+        return debris_profile_for(self.land_use)
+    
+    # Columns to_dict() copies unchanged, fetched in a single attrgetter call
+    DICT_FIELDS = ('id', 'name', 'latitude', 'longitude', 'image', 'admin_id', 'state', 'district')
+    _dict_values = operator.attrgetter(*DICT_FIELDS)
     
     def to_dict(self):
         """Convert river to dictionary"""
-        return {
-            'id': self.id,
-            'name': self.name,
-            'latitude': self.latitude,
-            'longitude': self.longitude,
-            'info': self.info or '',
-            'image': self.image,
-            'added_by': self.added_by_admin.name if self.added_by_admin else 'System',
-            'date_added': self.date_added.strftime('%Y-%m-%d') if self.date_added else None,
-            'state': self.state,
-            'district': self.district,
-            'land_use': self.land_use or 'urban',
-            'debris_profile': self.get_debris_profile()
-        }
+        data = dict(zip(self.DICT_FIELDS, self._dict_values(self)))
+        data['info'] = self.info or ''
+        data['added_by'] = self.added_by_admin.name if self.added_by_admin else 'System'
+        data['date_added'] = format_date(self.date_added)
+        data['land_use'] = self.land_use or 'urban'
+        data['debris_profile'] = self.get_debris_profile()
+        return data
     
     def __repr__(self):
         return f'<River {self.name}>'
@@ -191,23 +299,28 @@ class DRIReading(db.Model):
     
     id = db.Column(db.Integer, primary_key=True)
     river_id = db.Column(db.Integer, db.ForeignKey('rivers.id'), nullable=False)
-    dri_score = db.Column(db.Float, nullable=False)
+    # Scores and sensor factors are stored as 4-byte REAL (~7 significant
+    # digits, far beyond the 2-decimal precision the DRI works with)
+    dri_score = db.Column(db.REAL, nullable=False)
     risk_level = db.Column(db.String(20), nullable=False)
     
     # Environmental factors
-    rainfall = db.Column(db.Float, nullable=True)
-    wind_speed = db.Column(db.Float, nullable=True)
-    tide_level = db.Column(db.Float, nullable=True)
-    water_flow = db.Column(db.Float, nullable=True)
+    rainfall = db.Column(db.REAL, nullable=True)
+    wind_speed = db.Column(db.REAL, nullable=True)
+    tide_level = db.Column(db.REAL, nullable=True)
+    water_flow = db.Column(db.REAL, nullable=True)
     
     # Prediction
-    estimated_debris_kg = db.Column(db.Float, nullable=True)
+    estimated_debris_kg = db.Column(db.REAL, nullable=True)
     
     # Timestamp
-    recorded_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
+    recorded_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, server_default=utcnow(), index=True)
     
     # Relationship
-    river = db.relationship('River', backref=db.backref('readings', lazy='dynamic'))
+    river = db.relationship('River', back_populates='readings')
+    
+    # History/export queries filter on river and a recorded_at range
+    __table_args__ = (db.Index('ix_dri_river_recorded', 'river_id', 'recorded_at'),)
     
     def to_dict(self):
         return {
@@ -220,7 +333,7 @@ class DRIReading(db.Model):
             'tide_level': self.tide_level,
             'water_flow': self.water_flow,
             'estimated_debris_kg': self.estimated_debris_kg,
-            'recorded_at': self.recorded_at.strftime('%Y-%m-%d %H:%M:%S') if self.recorded_at else None
+            'recorded_at': format_datetime(self.recorded_at)
         }
     
     def __repr__(self):
@@ -240,8 +353,8 @@ class HotspotReport(db.Model):
     river_id = db.Column(db.Integer, db.ForeignKey('rivers.id'), nullable=False)
     
     # Report details
-    debris_type = db.Column(db.String(50), nullable=False)  # plastic, organic, household, industrial, mixed
-    estimated_amount = db.Column(db.String(50), nullable=False)  # small, medium, large, massive
+    debris_type = db.Column(debris_type_enum, nullable=False)
+    estimated_amount = db.Column(debris_amount_enum, nullable=False)
     
     # Exact quantities (kg)
     plastic_amount = db.Column(db.Float, nullable=True, default=0.0)
@@ -265,50 +378,46 @@ class HotspotReport(db.Model):
     longitude = db.Column(db.Float, nullable=True)
     
     # Status
-    status = db.Column(db.String(20), default='pending')  # pending, reviewed, resolved
+    status = db.Column(report_status_enum, default='pending')
     admin_notes = db.Column(db.Text, nullable=True)
     reviewed_by = db.Column(db.Integer, db.ForeignKey('admins.id'), nullable=True)
     reviewed_at = db.Column(db.DateTime, nullable=True)
     
     # Timestamps
-    reported_at = db.Column(db.DateTime, default=datetime.utcnow)
+    reported_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, server_default=utcnow())
     sighting_date = db.Column(db.DateTime, nullable=True)
     
     # Relationships
-    user = db.relationship('User', backref=db.backref('hotspot_reports', lazy='dynamic'))
-    river = db.relationship('River', backref=db.backref('reports', lazy='dynamic'))
-    # reviewer relationship is defined via backref in models.Admin
+    user = db.relationship('User', back_populates='hotspot_reports')
+    river = db.relationship('River', back_populates='reports')
+    reviewer = db.relationship('Admin', back_populates='hotspot_reports')
+    
+    # Listings filter on the NGO, river or review status and order by newest first
+    __table_args__ = (
+        db.Index('ix_hotspot_user_reported', 'user_id', 'reported_at'),
+        db.Index('ix_hotspot_river_reported', 'river_id', 'reported_at'),
+        db.Index('ix_hotspot_status_reported', 'status', 'reported_at'),
+    )
+    
+    # Columns to_dict() copies unchanged, fetched in a single attrgetter call
+    DICT_FIELDS = (
+        'id', 'user_id', 'river_id', 'debris_type', 'estimated_amount',
+        'plastic_amount', 'organic_amount', 'household_amount', 'industrial_amount', 'others_amount',
+        'snapshot_rainfall', 'snapshot_wind_speed', 'snapshot_tide_level', 'snapshot_water_flow',
+        'snapshot_estimated_payload', 'description', 'photo', 'latitude', 'longitude',
+        'status', 'admin_notes'
+    )
+    _dict_values = operator.attrgetter(*DICT_FIELDS)
     
     def to_dict(self):
-        return {
-            'id': self.id,
-            'user_id': self.user_id,
-            'user_name': self.user.ngo_name if self.user else 'Unknown',
-            'user_type': 'ngo' if self.user_id else 'unknown',
-            'river_id': self.river_id,
-            'river_name': self.river.name if self.river else None,
-            'debris_type': self.debris_type,
-            'estimated_amount': self.estimated_amount,
-            'plastic_amount': self.plastic_amount,
-            'organic_amount': self.organic_amount,
-            'household_amount': self.household_amount,
-            'industrial_amount': self.industrial_amount,
-            'others_amount': self.others_amount,
-            'snapshot_rainfall': self.snapshot_rainfall,
-            'snapshot_wind_speed': self.snapshot_wind_speed,
-            'snapshot_tide_level': self.snapshot_tide_level,
-            'snapshot_water_flow': self.snapshot_water_flow,
-            'snapshot_estimated_payload': self.snapshot_estimated_payload,
-            'description': self.description,
-            'photo': self.photo,
-            'latitude': self.latitude,
-            'longitude': self.longitude,
-            'status': self.status,
-            'admin_notes': self.admin_notes,
-            'reported_at': self.reported_at.strftime('%Y-%m-%d %H:%M') if self.reported_at else None,
-            'sighting_date': self.sighting_date.strftime('%Y-%m-%d') if self.sighting_date else None,
-            'reviewed_at': self.reviewed_at.strftime('%Y-%m-%d') if self.reviewed_at else None
-        }
+        data = dict(zip(self.DICT_FIELDS, self._dict_values(self)))
+        data['user_name'] = self.user.ngo_name if self.user else 'Unknown'
+        data['user_type'] = 'ngo' if self.user_id else 'unknown'
+        data['river_name'] = self.river.name if self.river else None
+        data['reported_at'] = format_datetime(self.reported_at, 'minutes')
+        data['sighting_date'] = format_date(self.sighting_date)
+        data['reviewed_at'] = format_date(self.reviewed_at)
+        return data
     
     def __repr__(self):
         return f'<DebrisReport {self.id} - {self.debris_type}>'
@@ -328,12 +437,12 @@ class Watchlist(db.Model):
     email_alerts = db.Column(db.Boolean, default=False)
     
     # Timestamps
-    added_at = db.Column(db.DateTime, default=datetime.utcnow)
+    added_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, server_default=utcnow())
     last_alert_sent = db.Column(db.DateTime, nullable=True)
     
     # Relationships
-    user = db.relationship('User', backref=db.backref('watchlist', lazy='dynamic'))
-    river = db.relationship('River', backref=db.backref('watchers', lazy='dynamic'))
+    user = db.relationship('User', back_populates='watchlist')
+    river = db.relationship('River', back_populates='watchers')
     
     # Unique constraint - user can only watch a river once
     __table_args__ = (db.UniqueConstraint('user_id', 'river_id', name='unique_user_river_watch'),)
@@ -348,7 +457,7 @@ class Watchlist(db.Model):
             'alert_on_high': self.alert_on_high,
             'alert_on_critical': self.alert_on_critical,
             'email_alerts': self.email_alerts,
-            'added_at': self.added_at.strftime('%Y-%m-%d %H:%M') if self.added_at else None
+            'added_at': format_datetime(self.added_at, 'minutes')
         }
     
     def __repr__(self):
@@ -368,7 +477,7 @@ class LocationRequest(db.Model):
     longitude = db.Column(db.Float, nullable=False)
     state = db.Column(db.String(100), nullable=True)
     district = db.Column(db.String(100), nullable=True)
-    land_use = db.Column(db.String(50), default='urban')
+    land_use = db.Column(land_use_enum, default='urban')
     
     # Request details
     reason = db.Column(db.Text, nullable=False)
@@ -376,7 +485,7 @@ class LocationRequest(db.Model):
     photo = db.Column(db.String(255), nullable=True)
     
     # Status
-    status = db.Column(db.String(20), default='pending')  # pending, approved, rejected
+    status = db.Column(request_status_enum, default='pending')
     admin_response = db.Column(db.Text, nullable=True)
     reviewed_by = db.Column(db.Integer, db.ForeignKey('admins.id'), nullable=True)
     reviewed_at = db.Column(db.DateTime, nullable=True)
@@ -385,32 +494,32 @@ class LocationRequest(db.Model):
     created_river_id = db.Column(db.Integer, db.ForeignKey('rivers.id'), nullable=True)
     
     # Timestamps
-    requested_at = db.Column(db.DateTime, default=datetime.utcnow)
+    requested_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, server_default=utcnow())
     
     # Relationships
-    user = db.relationship('User', backref=db.backref('location_requests', lazy='dynamic'))
-    reviewer = db.relationship('Admin', backref=db.backref('reviewed_requests', lazy='dynamic'))
-    created_river = db.relationship('River', backref=db.backref('request', uselist=False))
+    user = db.relationship('User', back_populates='location_requests')
+    reviewer = db.relationship('Admin', back_populates='reviewed_requests')
+    created_river = db.relationship('River', back_populates='request')
+    
+    # "My requests" and the admin status filter order by newest first
+    __table_args__ = (
+        db.Index('ix_locreq_user_requested', 'user_id', 'requested_at'),
+        db.Index('ix_locreq_status_requested', 'status', 'requested_at'),
+    )
+    
+    # Columns to_dict() copies unchanged, fetched in a single attrgetter call
+    DICT_FIELDS = (
+        'id', 'user_id', 'location_name', 'latitude', 'longitude', 'state', 'district',
+        'land_use', 'reason', 'additional_info', 'photo', 'status', 'admin_response'
+    )
+    _dict_values = operator.attrgetter(*DICT_FIELDS)
     
     def to_dict(self):
-        return {
-            'id': self.id,
-            'user_id': self.user_id,
-            'user_name': self.user.ngo_name if self.user else None,
-            'location_name': self.location_name,
-            'latitude': self.latitude,
-            'longitude': self.longitude,
-            'state': self.state,
-            'district': self.district,
-            'land_use': self.land_use,
-            'reason': self.reason,
-            'additional_info': self.additional_info,
-            'photo': self.photo,
-            'status': self.status,
-            'admin_response': self.admin_response,
-            'reviewed_at': self.reviewed_at.strftime('%Y-%m-%d %H:%M') if self.reviewed_at else None,
-            'requested_at': self.requested_at.strftime('%Y-%m-%d %H:%M') if self.requested_at else None
-        }
+        data = dict(zip(self.DICT_FIELDS, self._dict_values(self)))
+        data['user_name'] = self.user.ngo_name if self.user else None
+        data['reviewed_at'] = format_datetime(self.reviewed_at, 'minutes')
+        data['requested_at'] = format_datetime(self.requested_at, 'minutes')
+        return data
     
     def __repr__(self):
         return f'<LocationRequest {self.id} - {self.location_name}>'
@@ -437,12 +546,21 @@ class Alert(db.Model):
     is_read = db.Column(db.Boolean, default=False)
     
     # Timestamps
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, server_default=utcnow())
     read_at = db.Column(db.DateTime, nullable=True)
     
     # Relationships
-    user = db.relationship('User', backref=db.backref('alerts', lazy='dynamic'))
-    river = db.relationship('River', backref=db.backref('alerts', lazy='dynamic'))
+    user = db.relationship('User', back_populates='alerts')
+    river = db.relationship('River', back_populates='alerts')
+    
+    # Alert feed orders a user's alerts by newest first; the partial index
+    # keeps the unread queue small no matter how many alerts were read
+    __table_args__ = (
+        db.Index('ix_alerts_user_created', 'user_id', 'created_at'),
+        db.Index('ix_alerts_unread', 'user_id', 'created_at',
+                 postgresql_where=db.text('is_read = false'),
+                 sqlite_where=db.text('is_read = 0')),
+    )
     
     def to_dict(self):
         return {
@@ -453,8 +571,54 @@ class Alert(db.Model):
             'message': self.message,
             'river_id': self.river_id,
             'is_read': self.is_read,
-            'created_at': self.created_at.strftime('%Y-%m-%d %H:%M') if self.created_at else None
+            'created_at': format_datetime(self.created_at, 'minutes')
         }
     
     def __repr__(self):
         return f'<Alert {self.id} - {self.alert_type}>'
+
+
+# Triggers maintaining users.unread_alert_count: +1 for each unread alert
+# inserted, -1 when one is marked read or deleted. Installed when create_all
+# builds the alerts table; `flask --app app init-alert-counter` installs them
+# on an existing database.
+ALERT_COUNTER_SQL = {
+    'postgresql': (
+        """CREATE OR REPLACE FUNCTION alerts_unread_counter() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP <> 'INSERT' THEN
+        IF OLD.is_read IS FALSE THEN
+            UPDATE users SET unread_alert_count = unread_alert_count - 1 WHERE id = OLD.user_id;
+        END IF;
+    END IF;
+    IF TG_OP <> 'DELETE' THEN
+        IF NEW.is_read IS FALSE THEN
+            UPDATE users SET unread_alert_count = unread_alert_count + 1 WHERE id = NEW.user_id;
+        END IF;
+    END IF;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql""",
+        "DROP TRIGGER IF EXISTS alerts_unread_counter ON alerts",
+        "CREATE TRIGGER alerts_unread_counter AFTER INSERT OR DELETE OR UPDATE OF is_read, user_id "
+        "ON alerts FOR EACH ROW EXECUTE FUNCTION alerts_unread_counter()",
+    ),
+    'sqlite': (
+        "DROP TRIGGER IF EXISTS alerts_unread_insert",
+        "CREATE TRIGGER alerts_unread_insert AFTER INSERT ON alerts WHEN NEW.is_read = 0 BEGIN "
+        "UPDATE users SET unread_alert_count = unread_alert_count + 1 WHERE id = NEW.user_id; END",
+        "DROP TRIGGER IF EXISTS alerts_unread_delete",
+        "CREATE TRIGGER alerts_unread_delete AFTER DELETE ON alerts WHEN OLD.is_read = 0 BEGIN "
+        "UPDATE users SET unread_alert_count = unread_alert_count - 1 WHERE id = OLD.user_id; END",
+        "DROP TRIGGER IF EXISTS alerts_unread_update",
+        "CREATE TRIGGER alerts_unread_update AFTER UPDATE OF is_read, user_id ON alerts BEGIN "
+        "UPDATE users SET unread_alert_count = unread_alert_count - 1 WHERE id = OLD.user_id AND OLD.is_read = 0; "
+        "UPDATE users SET unread_alert_count = unread_alert_count + 1 WHERE id = NEW.user_id AND NEW.is_read = 0; END",
+    ),
+}
+
+@event.listens_for(Alert.__table__, 'after_create')
+def create_alert_counter_triggers(target, connection, **kw):
+    """Install the unread counter triggers alongside a new alerts table"""
+    for statement in ALERT_COUNTER_SQL.get(connection.dialect.name, ()):
+        connection.exec_driver_sql(statement)
@@ -138,7 +138,7 @@ function showToast(message, type = 'success') {
 
 async function loadRiversForDropdowns() {
     try {
-        const response = await fetch('/api/rivers');
+        const response = await fetch('/api/rivers?fields=id,name');
         const rivers = await response.json();
         
         const reportSelect = document.getElementById('report-river');